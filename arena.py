@@ -0,0 +1,68 @@
+import argparse, json, time
+from lib.constantes import *
+from lib.arena import Arena, tracking_controller, network_controller
+from lib.rede_neural import Network
+
+
+def play(arena: Arena, controlador, humano: bool):
+    '''Função que mostra a arena em uma janela do pygame, um passo por quadro.
+
+    Parâmetros:
+    - `arena:` Arena;
+    - `controlador:` Função `(arena) -> ações` das raquetes;
+    - `humano:` Se a primeira raquete da esquerda é controlada pelas setas;
+    '''
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode((LARGURA, ALTURA))
+    pygame.display.set_caption('Pong IA - Arena')
+    clock = pygame.time.Clock()
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+        acoes = controlador(arena)
+        if humano:
+            keys = pygame.key.get_pressed()
+            acoes[0] = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        arena.step(acoes)
+        screen.fill('#202020')
+        pygame.draw.line(screen, 'white', (0, 80), (LARGURA, 80))
+        for x, y, largura, altura in zip(arena.raquete_x, arena.raquete_y, arena.raquete_largura, arena.raquete_altura):
+            pygame.draw.rect(screen, 'white', (x, y, largura, altura))
+        for x, y in zip(arena.bola_x, arena.bola_y):
+            pygame.draw.rect(screen, 'white', (x, y, 10, 10))
+        pygame.display.update()
+        clock.tick(FPS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arena com várias bolas e raquetes, para testar controladores em quadras lotadas.')
+    parser.add_argument('--bolas', type=int, default=20)
+    parser.add_argument('--por-lado', type=int, default=1, help='Raquetes em cada lado')
+    parser.add_argument('--lados', type=int, choices=[2, 4], default=2)
+    parser.add_argument('--velocidade', type=int, default=VELOCIDADE, help='Velocidade das bolas')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--rede', help='Rede (formato do network.json) que controla as raquetes; sem ela, elas seguem a bola')
+    parser.add_argument('--humano', action='store_true', help='Controla a primeira raquete da esquerda com as setas')
+    parser.add_argument('--frames', type=int, help='Simula sem tela essa quantidade de quadros e mostra o resultado')
+    parser.add_argument('--todos-os-pares', action='store_true', help='Testa todos os pares bola-raquete, sem a fase ampla')
+    args = parser.parse_args()
+
+    arena = Arena(args.bolas, args.por_lado, args.lados, args.seed, args.velocidade, not args.todos_os_pares)
+    controlador = tracking_controller
+    if args.rede:
+        with open(args.rede, 'r') as file:
+            controlador = network_controller(Network(**json.load(file)).compile())
+    if args.frames is None:
+        play(arena, controlador, args.humano)
+        return
+    inicio = time.perf_counter()
+    arena.simulate(args.frames, controlador)
+    duracao = time.perf_counter() - inicio
+    print(f'{args.frames} quadros em {duracao:.2f} s ({args.frames / duracao:.0f} quadros/s), pontos sofridos por lado: {arena.sofridos[:args.lados].tolist()}')
+
+
+if __name__ == '__main__':
+    main()
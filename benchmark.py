@@ -0,0 +1,256 @@
+import argparse, datetime, json, os, platform, subprocess, sys, time, timeit
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import numpy
+from lib.constantes import *
+from lib.rede_neural import Network
+from lib.simulacao import Simulacao, tracking_controller, PARADO
+
+
+ESTRUTURAS = {
+    'largo': [{'numbers_of_neurons': 1}, {'numbers_of_neurons': 256, 'activation_function': 'tanh'}, {'numbers_of_neurons': 256, 'activation_function': 'tanh'}, {'numbers_of_neurons': 2, 'activation_function': 'relu'}],
+    'profundo': [{'numbers_of_neurons': 1}] + [{'numbers_of_neurons': 32, 'activation_function': 'tanh'}] * 8 + [{'numbers_of_neurons': 2, 'activation_function': 'relu'}],
+    'recorrente': [{'numbers_of_neurons': 1}, {'numbers_of_neurons': 32, 'activation_function': 'tanh', 'recurrent': True}, {'numbers_of_neurons': 2, 'activation_function': 'relu'}]
+}
+'''Estruturas medidas além do `network.json`.'''
+
+MODULOS_SEM_PYGAME = ('lib.rede_neural', 'lib.simulacao', 'lib.vetorizado', 'lib.arena', 'lib.dataset', 'lib.ambiente', 'lib.replay', 'lib.classes')
+'''Módulos que devem ser importados só com o NumPy, sem carregar o pygame.'''
+
+
+def measure(funcao, repeticoes: int = 5) -> float:
+    '''Função que retorna o tempo de uma chamada, em segundos: o menor entre várias repetições.
+
+    O número de chamadas de cada repetição é ajustado para ela durar pelo menos 0,2 s.
+
+    Parâmetros:
+    - `funcao:` Função sem parâmetros;
+    - `repeticoes:` Quantidade de repetições (opcional);
+    '''
+    timer = timeit.Timer(funcao)
+    numero, _ = timer.autorange()
+    return min(timer.repeat(repeticoes, numero)) / numero
+
+
+def result(valor: float, unidade: str, maior_melhor: bool) -> dict:
+    '''Função que monta um resultado.
+
+    Parâmetros:
+    - `valor:` Valor medido;
+    - `unidade:` Unidade do valor;
+    - `maior_melhor:` Se valores maiores são melhores (ex.: quadros/s) ou piores (ex.: latência);
+    '''
+    return {'valor': valor, 'unidade': unidade, 'maior_melhor': maior_melhor}
+
+
+def networks() -> dict:
+    '''Função que retorna as redes medidas: o `network.json` e as estruturas de `ESTRUTURAS`.'''
+    with open(os.path.join(DIRETORIO_PRINCIPAL, 'network.json'), 'r') as file:
+        redes = {'network_json': Network(**json.load(file), seed=0)}
+    for nome, estrutura in ESTRUTURAS.items():
+        redes[nome] = Network(estrutura, weights_initialization='xavier', seed=0)
+    return redes
+
+
+def bench_forward(repeticoes: int) -> dict:
+    '''Função que mede a latência do `forward` (grafo de objetos e compilado) e a vazão do `forward_batch`.
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    resultados = {}
+    lote = numpy.random.default_rng(0).uniform(-300, 300, size=(1024, 1))
+    for nome, rede in networks().items():
+        compilada = rede.compile()
+        entrada = [12.0] * rede.get_inputs()
+        resultados[f'forward.{nome}'] = result(measure(lambda: rede.forward(entrada), repeticoes) * 1e6, 'us', False)
+        resultados[f'forward_compilado.{nome}'] = result(measure(lambda: compilada.forward(entrada), repeticoes) * 1e6, 'us', False)
+        compilada.reset_hidden_states()
+        resultados[f'forward_batch.{nome}'] = result(len(lote) / measure(lambda: compilada.forward_batch(lote), repeticoes), 'amostras/s', True)
+    return resultados
+
+
+def bench_training(repeticoes: int) -> dict:
+    '''Função que mede a vazão do `backpropagation` (uma amostra por chamada) e do `fit` (mini-lotes).
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    resultados = {}
+    rng = numpy.random.default_rng(0)
+    X = rng.uniform(-1, 1, size=(1024, 1))
+    Y = numpy.concatenate([X > 0, X < 0], axis=1).astype(float)
+    for nome, rede in networks().items():
+        if rede.get_structure()[1].get('recurrent'):
+            continue
+        resultados[f'backpropagation.{nome}'] = result(1 / measure(lambda: rede.backpropagation(X[0], Y[0], 0.01), repeticoes), 'amostras/s', True)
+        resultados[f'fit.{nome}'] = result(len(X) / measure(lambda: rede.fit(X, Y, epochs=1, batch_size=32, learning_rate=0.01), repeticoes), 'amostras/s', True)
+    return resultados
+
+
+def bench_simulation(repeticoes: int) -> dict:
+    '''Função que mede os quadros por segundo da `Simulacao` e do `Game.update` sem tela.
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    import pygame
+    from lib.classes import Game
+    simulacao = Simulacao(seed=0)
+    controlador = lambda: simulacao.step(tracking_controller(simulacao.jogador1, simulacao.bola), tracking_controller(simulacao.jogador2, simulacao.bola), True)
+    pygame.init()
+    jogo = Game(pygame.display.set_mode((LARGURA, ALTURA)), seed=0)
+    return {
+        'simulacao.step': result(1 / measure(controlador, repeticoes), 'quadros/s', True),
+        'game.update': result(1 / measure(lambda: jogo.update((PARADO, True)), repeticoes), 'quadros/s', True)
+    }
+
+
+def bench_draw(repeticoes: int) -> dict:
+    '''Função que mede o tempo de desenho de um quadro com o driver de vídeo `dummy` do SDL.
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    import pygame
+    from lib.classes import Game
+    from lib.renderizador import RenderizadorParcial
+    pygame.init()
+    screen = pygame.display.set_mode((LARGURA, ALTURA))
+    jogo = Game(screen, seed=0)
+    def completo():
+        jogo.update((PARADO, True))
+        screen.fill('#202020')
+        jogo.draw()
+    parcial = Game(screen, seed=0)
+    renderizador = RenderizadorParcial(parcial)
+    def retangulos():
+        parcial.update((PARADO, True))
+        renderizador.draw()
+        renderizador.sujos = []
+    return {
+        'game.draw': result(measure(completo, repeticoes) * 1e3, 'ms', False),
+        'renderizador_parcial.draw': result(measure(retangulos, repeticoes) * 1e3, 'ms', False)
+    }
+
+
+def bench_import(repeticoes: int) -> dict:
+    '''Função que mede o tempo de importação de cada módulo em um interpretador novo, como em um processo de um pool.
+
+    O tempo de subir o interpretador vazio é descontado. Falha se algum módulo de
+    `MODULOS_SEM_PYGAME` carregar o pygame.
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    def tempo(codigo: str) -> float:
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, '-c', codigo], cwd=raiz, stdout=subprocess.DEVNULL, check=True)
+            melhor = min(melhor, time.perf_counter() - inicio)
+        return melhor
+    # Uma importação antes das medidas para os .pyc já estarem compilados.
+    subprocess.run([sys.executable, '-c', f'import {", ".join(MODULOS_SEM_PYGAME)}, pygame'], cwd=raiz, stdout=subprocess.DEVNULL, check=True)
+    vazio = tempo('pass')
+    resultados = {'importacao.python': result(vazio * 1e3, 'ms', False)}
+    for modulo in MODULOS_SEM_PYGAME:
+        resultados[f'importacao.{modulo}'] = result((tempo(f'import sys, {modulo}\nassert "pygame" not in sys.modules, "{modulo} imported pygame"') - vazio) * 1e3, 'ms', False)
+    resultados['importacao.pygame'] = result((tempo('import pygame') - vazio) * 1e3, 'ms', False)
+    return resultados
+
+
+def bench_arena(repeticoes: int) -> dict:
+    '''Função que mede a `Arena` lotada (4 lados, 4 raquetes por lado) com 1.000 e 10.000 bolas, com e sem a fase ampla.
+
+    Parâmetros:
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    from lib.arena import Arena, tracking_controller
+    resultados = {}
+    for bolas in (1_000, 10_000):
+        for fase_ampla, nome in ((True, 'fase_ampla'), (False, 'todos_os_pares')):
+            arena = Arena(bolas, raquetes_por_lado=4, lados=4, seed=0, fase_ampla=fase_ampla)
+            resultados[f'arena.step.{bolas}.{nome}'] = result(1 / measure(lambda: arena.step(tracking_controller(arena)), repeticoes), 'quadros/s', True)
+            resultados[f'arena.collide.{bolas}.{nome}'] = result(measure(arena.collide, repeticoes) * 1e3, 'ms', False)
+    return resultados
+
+
+GRUPOS = {'importacao': bench_import, 'forward': bench_forward, 'treino': bench_training, 'simulacao': bench_simulation, 'arena': bench_arena, 'desenho': bench_draw}
+'''Grupos de medidas, na ordem em que são executados.'''
+
+
+def run(grupos: list[str], repeticoes: int) -> dict:
+    '''Função que executa os grupos de medidas e retorna o relatório com o ambiente da máquina.
+
+    Parâmetros:
+    - `grupos:` Nomes dos grupos de `GRUPOS`;
+    - `repeticoes:` Repetições de cada medida;
+    '''
+    import pygame
+    resultados = {}
+    for grupo in grupos:
+        print(f'{grupo}...', file=sys.stderr)
+        resultados.update(GRUPOS[grupo](repeticoes))
+    return {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'maquina': {'plataforma': platform.platform(), 'processador': platform.processor() or platform.machine(), 'python': platform.python_version(), 'numpy': numpy.__version__, 'pygame': pygame.version.ver},
+        'resultados': resultados
+    }
+
+
+def compare(base: dict, atual: dict, tolerancia: float) -> list[dict]:
+    '''Função que compara dois relatórios e retorna uma linha por medida presente nos dois.
+
+    Parâmetros:
+    - `base:` Relatório de referência;
+    - `atual:` Relatório novo;
+    - `tolerancia:` Variação relativa aceita antes de uma medida ser marcada como mais lenta (ex.: 0.1 = 10%);
+    '''
+    linhas = []
+    for nome, medida in atual['resultados'].items():
+        if nome not in base['resultados']:
+            continue
+        anterior = base['resultados'][nome]['valor']
+        # Convertido para "vezes mais rápido", então < 1 é sempre uma piora.
+        aceleracao = medida['valor'] / anterior if medida['maior_melhor'] else anterior / medida['valor']
+        linhas.append({'nome': nome, 'base': anterior, 'atual': medida['valor'], 'unidade': medida['unidade'], 'aceleracao': aceleracao, 'mais_lento': aceleracao < 1 - tolerancia})
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks da rede neural, da simulação e do desenho.')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    executar = subparsers.add_parser('run', help='Executa as medidas e salva em JSON')
+    executar.add_argument('--saida', default='benchmark.json', help='Arquivo JSON com os resultados')
+    executar.add_argument('--grupos', nargs='*', choices=list(GRUPOS), default=list(GRUPOS), help='Grupos de medidas executados')
+    executar.add_argument('--repeticoes', type=int, default=5, help='Repetições de cada medida (vale a menor)')
+    comparar = subparsers.add_parser('compare', help='Compara um resultado com uma referência e falha se algo ficou mais lento')
+    comparar.add_argument('base', help='JSON de referência')
+    comparar.add_argument('atual', help='JSON novo')
+    comparar.add_argument('--tolerancia', type=float, default=0.1, help='Piora relativa aceita (padrão: 10%%)')
+    args = parser.parse_args()
+
+    if args.comando == 'run':
+        relatorio = run(args.grupos, args.repeticoes)
+        with open(args.saida, 'w') as file:
+            json.dump(relatorio, file, indent=2)
+        for nome, medida in relatorio['resultados'].items():
+            print(f'{nome:<40} {medida["valor"]:>14.2f} {medida["unidade"]}')
+        return
+
+    with open(args.base, 'r') as file:
+        base = json.load(file)
+    with open(args.atual, 'r') as file:
+        atual = json.load(file)
+    linhas = compare(base, atual, args.tolerancia)
+    print(f'{"medida":<40} {"base":>14} {"atual":>14} {"":<10} {"ganho":>7}')
+    for linha in linhas:
+        marca = '  MAIS LENTO' if linha['mais_lento'] else ''
+        print(f'{linha["nome"]:<40} {linha["base"]:>14.2f} {linha["atual"]:>14.2f} {linha["unidade"]:<10} {linha["aceleracao"]:>6.2f}x{marca}')
+    if any(linha['mais_lento'] for linha in linhas):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
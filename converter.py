@@ -0,0 +1,19 @@
+import argparse, os
+from lib.rede_neural import convert_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Converte redes no formato do network.json para o formato binário.')
+    parser.add_argument('arquivos', nargs='+', help='Arquivos .json')
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float64', help='Tipo dos números guardados')
+    parser.add_argument('--extensao', default='.bin', help='Extensão dos arquivos gerados')
+    args = parser.parse_args()
+
+    for source in args.arquivos:
+        destination = os.path.splitext(source)[0] + args.extensao
+        convert_json(source, destination, args.dtype)
+        print(f'{source} -> {destination}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import argparse, json, os
+from concurrent.futures import ProcessPoolExecutor
+from numpy import ndarray, array, argsort, concatenate, random
+from lib.rede_neural import Network
+from lib.populacao import PopulacaoCompartilhada
+from lib.vetorizado import SimulacaoVetorizada, network_controller, tracking_controller
+
+
+compartilhada = None
+'''População compartilhada vista pelo processo, conectada uma única vez.'''
+
+
+def init_worker(structure: list[dict], populacao: int, nome: str):
+    '''Função que conecta o processo à população compartilhada uma única vez.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    - `populacao:` Tamanho da população;
+    - `nome:` Nome do bloco de memória compartilhada;
+    '''
+    global compartilhada
+    compartilhada = PopulacaoCompartilhada.attach(structure, populacao, nome)
+
+
+def fitness(idx: int, seed: int, partidas: int, frames: int, velocidade: int) -> float:
+    '''Função que mede o desempenho de um genoma: saldo médio de pontos contra o controlador que segue a bola.
+
+    Parâmetros:
+    - `idx:` Índice do genoma na população compartilhada;
+    - `seed:` Semente das partidas;
+    - `partidas:` Partidas simultâneas;
+    - `frames:` Quadros de cada partida;
+    - `velocidade:` Velocidade da bola;
+    '''
+    simulacao = SimulacaoVetorizada(partidas, seed, velocidade)
+    simulacao.simulate(frames, tracking_controller, network_controller(compartilhada.network(idx)))
+    return float((simulacao.jogador2_pontos - simulacao.jogador1_pontos).mean())
+
+
+def save_checkpoint(structure: list[dict], genome: ndarray, path: str):
+    '''Função que salva um genoma no formato lido pelo `PlayerIA`.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    - `genome:` Vetor de parâmetros;
+    - `path:` Caminho do arquivo;
+    '''
+    network = Network(structure)
+    network.set_parameters(genome)
+    with open(path, 'w') as file:
+        json.dump(network.to_dict(), file)
+
+
+def evolve(structure: list[dict], geracoes: int, populacao: int, elite: int, sigma: float, partidas: int, frames: int, velocidade: int, saida: str, seed: int = 0, workers: int | None = None) -> ndarray:
+    '''Função que evolui uma população de redes e retorna o melhor genoma.
+
+    A cada geração todos os genomas são avaliados em paralelo com as mesmas sementes, os
+    `elite` melhores são mantidos e o resto da população é formado por cópias mutadas deles.
+    O melhor genoma encontrado é salvo em `saida` sempre que melhora. Os genomas ficam em uma
+    `PopulacaoCompartilhada`: os processos recebem só os índices, e cada geração é escrita no
+    mesmo bloco.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    - `geracoes:` Quantidade de gerações;
+    - `populacao:` Tamanho da população;
+    - `elite:` Genomas mantidos de uma geração para a outra, entre 1 e `populacao - 1`;
+    - `sigma:` Desvio padrão da mutação;
+    - `partidas:` Partidas simultâneas por avaliação;
+    - `frames:` Quadros de cada partida;
+    - `velocidade:` Velocidade da bola;
+    - `saida:` Arquivo do melhor genoma;
+    - `seed:` Semente da evolução (opcional);
+    - `workers:` Quantidade de processos, por padrão um por núcleo (opcional);
+    '''
+    if not 1 <= elite < populacao:
+        raise ValueError(f'Invalid elite {elite} for a population of {populacao}: it must be between 1 and {populacao - 1}.')
+    rng = random.default_rng(seed)
+    workers = workers or os.cpu_count()
+    chunksize = max(1, populacao // (4 * workers))
+    with PopulacaoCompartilhada(structure, populacao) as bloco:
+        # Cada rede recebe uma semente do `rng`, então os pesos ocultos das recorrentes também se repetem com a mesma `seed`.
+        bloco.genomes[:] = array([Network(structure, weights_initialization='xavier', seed=int(semente)).get_parameters() for semente in rng.integers(2 ** 63, size=populacao)])
+        best, best_score = bloco.genomes[0].copy(), float('-inf')
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(structure, populacao, bloco.nome)) as executor:
+            for geracao in range(geracoes):
+                seeds = [seed + geracao] * populacao
+                scores = array(list(executor.map(fitness, range(populacao), seeds, [partidas] * populacao, [frames] * populacao, [velocidade] * populacao, chunksize=chunksize)))
+                order = argsort(scores)[::-1]
+                if scores[order[0]] > best_score:
+                    best, best_score = bloco.genomes[order[0]].copy(), scores[order[0]]
+                    save_checkpoint(structure, best, saida)
+                print(f'geração {geracao + 1}/{geracoes}: melhor {scores[order[0]]:.3f}, média {scores.mean():.3f}, recorde {best_score:.3f}')
+
+                elites = bloco.genomes[order[:elite]]
+                children = elites[rng.integers(0, elite, populacao - elite)] + rng.normal(0, sigma, (populacao - elite, elites.shape[1]))
+                bloco.genomes[:] = concatenate([elites, children])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Neuroevolução de redes para o Pong.')
+    parser.add_argument('--ocultos', type=int, nargs='*', default=[8], help='Neurônios de cada camada oculta')
+    parser.add_argument('--ativacao', default='tanh', help='Função de ativação das camadas ocultas')
+    parser.add_argument('--recorrente', action='store_true', help='Usa neurônios recorrentes nas camadas ocultas')
+    parser.add_argument('--previsao', action='store_true', help='Dá à rede uma segunda entrada: a distância até a altura prevista da bola')
+    parser.add_argument('--geracoes', type=int, default=50)
+    parser.add_argument('--populacao', type=int, default=128)
+    parser.add_argument('--elite', type=int, default=16, help='Genomas mantidos a cada geração, entre 1 e --populacao - 1')
+    parser.add_argument('--sigma', type=float, default=0.1, help='Desvio padrão da mutação')
+    parser.add_argument('--partidas', type=int, default=64, help='Partidas simultâneas por avaliação')
+    parser.add_argument('--frames', type=int, default=3600, help='Quadros de cada partida')
+    parser.add_argument('--velocidade', type=int, default=5, help='Velocidade da bola')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help='Quantidade de processos')
+    parser.add_argument('--saida', default='melhor.json', help='Arquivo do melhor genoma')
+    args = parser.parse_args()
+    if not 1 <= args.elite < args.populacao:
+        parser.error(f'--elite must be between 1 and --populacao - 1 ({args.populacao - 1}), got {args.elite}')
+
+    structure = [{'numbers_of_neurons': 2 if args.previsao else 1}]
+    structure += [{'numbers_of_neurons': neurons, 'activation_function': args.ativacao, 'recurrent': args.recorrente} for neurons in args.ocultos]
+    structure += [{'numbers_of_neurons': 2, 'activation_function': 'relu'}]
+    evolve(structure, args.geracoes, args.populacao, args.elite, args.sigma, args.partidas, args.frames, args.velocidade, args.saida, args.seed, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+import os
+from multiprocessing import Pipe, Process
+from typing import Callable
+from numpy import ndarray, array, zeros, concatenate, float64
+from lib.constantes import *
+from lib.dataset import COLUNAS, state
+from lib.simulacao import Simulacao, Raquete, BolaSimulada, tracking_controller
+from lib import vetorizado
+
+
+OBSERVACOES = COLUNAS
+'''Colunas da observação, as mesmas do dataset gravado: `lado, distancia, bola_x, bola_y, vel_x, vel_y, raquete_y`.'''
+
+
+class Ambiente:
+    '''Ambiente no estilo do Gym sobre a `Simulacao`, sem pygame: um agente controla uma raquete.
+
+    Cada passo é um quadro do jogo com a bola sempre em jogo. A recompensa é +1 quando o agente
+    marca um ponto e -1 quando sofre, e o episódio termina quando um dos lados chega a `pontos`
+    ou depois de `frames_max` quadros.
+
+    Atributos:
+    - `lado:` Raquete do agente: 1 para a esquerda, 2 para a direita;
+    - `oponente:` Controlador `(raquete, bola) -> ação` da outra raquete;
+    - `pontos:` Pontos que encerram o episódio;
+    - `frames_max:` Quadros que encerram o episódio, ou `None`;
+    - `velocidade:` Velocidade da bola, em pixels por quadro, como na `SimulacaoVetorizada`;
+    - `continua:` Se a bola usa colisão contínua;
+    - `simulacao:` Partida atual;
+    - `frame:` Quadros do episódio atual;
+    '''
+    def __init__(self, lado: int = 2, oponente: Callable[[Raquete, BolaSimulada], int] = tracking_controller, pontos: int = 1, frames_max: int | None = None, velocidade: int = VELOCIDADE, continua: bool = False):
+        '''Método construtor.
+
+        Parâmetros:
+        - `lado:` Raquete do agente (opcional);
+        - `oponente:` Controlador da outra raquete (opcional);
+        - `pontos:` Pontos que encerram o episódio (opcional);
+        - `frames_max:` Quadros que encerram o episódio (opcional);
+        - `velocidade:` Velocidade da bola (opcional);
+        - `continua:` Usa colisão contínua (opcional);
+
+        ```
+        >>> ambiente = Ambiente()
+        >>> observacao = ambiente.reset(seed=42)
+        >>> observacao, recompensa, fim, info = ambiente.step(SOBE)
+        ```
+        '''
+        self.lado = lado
+        self.oponente = oponente
+        self.pontos = pontos
+        self.frames_max = frames_max
+        self.velocidade = velocidade
+        self.continua = continua
+        self.simulacao = None
+        self.frame = 0
+
+    def reset(self, seed: int | None = None) -> ndarray:
+        '''Método que começa um novo episódio e retorna a primeira observação.
+
+        Parâmetros:
+        - `seed:` Semente da partida (opcional);
+        '''
+        self.simulacao = Simulacao(seed=seed, velocidade=self.velocidade * FISICA_HZ, continua=self.continua)
+        self.frame = 0
+        return self.observation()
+
+    def observation(self) -> ndarray:
+        '''Método que retorna a observação do agente, no formato de `OBSERVACOES`.'''
+        raquete = self.simulacao.jogador1 if self.lado == 1 else self.simulacao.jogador2
+        return array(state(self.lado, raquete, self.simulacao.bola), dtype=float64)
+
+    def step(self, acao: int) -> tuple:
+        '''Método que avança um quadro e retorna `(observação, recompensa, fim, info)`.
+
+        Parâmetros:
+        - `acao:` `SOBE`, `PARADO` ou `DESCE`;
+        '''
+        if self.simulacao is None:
+            raise ValueError('Call reset() before step().')
+        simulacao = self.simulacao
+        if self.lado == 1:
+            acao1, acao2 = acao, self.oponente(simulacao.jogador2, simulacao.bola)
+        else:
+            acao1, acao2 = self.oponente(simulacao.jogador1, simulacao.bola), acao
+        antes = simulacao.jogador1_pontos - simulacao.jogador2_pontos
+        simulacao.step(acao1, acao2, True)
+        saldo = simulacao.jogador1_pontos - simulacao.jogador2_pontos - antes
+        self.frame += 1
+        fim = max(simulacao.jogador1_pontos, simulacao.jogador2_pontos) >= self.pontos
+        truncado = not fim and self.frames_max is not None and self.frame >= self.frames_max
+        info = {'frame': self.frame, 'pontos': (simulacao.jogador1_pontos, simulacao.jogador2_pontos), 'truncado': truncado}
+        return self.observation(), float(saldo if self.lado == 1 else -saldo), fim or truncado, info
+
+
+class AmbienteVetorizado:
+    '''Vários ambientes avançados juntos sobre a `SimulacaoVetorizada`, com reinício automático.
+
+    Segue as regras do `Ambiente`, mas `step` recebe um vetor de ações e retorna matrizes. Os
+    ambientes que terminam são reiniciados no mesmo passo: a observação retornada já é a do novo
+    episódio, e a última observação do episódio terminado fica em `info['observacao_final']`.
+
+    Atributos:
+    - `quantidade:` Quantidade de ambientes;
+    - `lado:` Raquete do agente: 1 para a esquerda, 2 para a direita;
+    - `oponente:` Controlador `(simulação, lado) -> ações` da outra raquete;
+    - `pontos:` Pontos que encerram o episódio;
+    - `frames_max:` Quadros que encerram o episódio, ou `None`;
+    - `velocidade:` Velocidade da bola;
+    - `simulacao:` Partidas atuais;
+    - `frames:` Quadros do episódio atual de cada ambiente;
+    '''
+    def __init__(self, quantidade: int, lado: int = 2, oponente: Callable = vetorizado.tracking_controller, pontos: int = 1, frames_max: int | None = None, velocidade: int = VELOCIDADE):
+        '''Método construtor.
+
+        Parâmetros:
+        - `quantidade:` Quantidade de ambientes;
+        - `lado:` Raquete do agente (opcional);
+        - `oponente:` Controlador da outra raquete (opcional);
+        - `pontos:` Pontos que encerram o episódio (opcional);
+        - `frames_max:` Quadros que encerram o episódio (opcional);
+        - `velocidade:` Velocidade da bola (opcional);
+        '''
+        self.quantidade = quantidade
+        self.lado = lado
+        self.oponente = oponente
+        self.pontos = pontos
+        self.frames_max = frames_max
+        self.velocidade = velocidade
+        self.simulacao = None
+        self.frames = zeros(quantidade, dtype=int)
+
+    def reset(self, seed: int | None = None) -> ndarray:
+        '''Método que começa novos episódios em todos os ambientes e retorna as observações.
+
+        Parâmetros:
+        - `seed:` Semente das partidas (opcional);
+        '''
+        self.simulacao = vetorizado.SimulacaoVetorizada(self.quantidade, seed, self.velocidade)
+        self.frames[:] = 0
+        return self.observation()
+
+    def observation(self) -> ndarray:
+        '''Método que retorna a matriz (ambientes, `OBSERVACOES`) das observações.'''
+        return self.simulacao.states(self.lado).astype(float64)
+
+    def step(self, acoes: ndarray) -> tuple:
+        '''Método que avança todos os ambientes um quadro e retorna `(observações, recompensas, fins, info)`.
+
+        Parâmetros:
+        - `acoes:` Vetor com a ação do agente em cada ambiente;
+        '''
+        if self.simulacao is None:
+            raise ValueError('Call reset() before step().')
+        simulacao = self.simulacao
+        outro = self.oponente(simulacao, 3 - self.lado)
+        antes = simulacao.jogador1_pontos - simulacao.jogador2_pontos
+        simulacao.step(*((acoes, outro) if self.lado == 1 else (outro, acoes)))
+        saldo = simulacao.jogador1_pontos - simulacao.jogador2_pontos - antes
+        self.frames += 1
+        terminados = (simulacao.jogador1_pontos >= self.pontos) | (simulacao.jogador2_pontos >= self.pontos)
+        truncados = ~terminados & (self.frames >= self.frames_max) if self.frames_max is not None else zeros(self.quantidade, dtype=bool)
+        fins = terminados | truncados
+        info = {'frames': self.frames.copy(), 'truncados': truncados}
+        if fins.any():
+            info['observacao_final'] = self.observation()
+            self.reset_done(fins)
+        return self.observation(), (saldo if self.lado == 1 else -saldo).astype(float64), fins, info
+
+    def reset_done(self, mask: ndarray):
+        '''Método que reinicia os ambientes cujo episódio terminou.
+
+        Parâmetros:
+        - `mask:` Ambientes reiniciados;
+        '''
+        simulacao = self.simulacao
+        simulacao.start[mask] = False
+        simulacao.new_direction(mask)
+        simulacao.jogador1_y[mask] = simulacao.jogador2_y[mask] = 290
+        simulacao.jogador1_pontos[mask] = simulacao.jogador2_pontos[mask] = 0
+        self.frames[mask] = 0
+
+
+def worker(conexao, criar: Callable[[], AmbienteVetorizado]):
+    '''Função executada em cada processo do `AmbienteParalelo`: cria o ambiente e responde aos comandos.
+
+    Parâmetros:
+    - `conexao:` Ponta do `Pipe` do processo;
+    - `criar:` Função (que possa ser serializada) que cria o `AmbienteVetorizado`;
+    '''
+    ambiente = criar()
+    while True:
+        comando, dados = conexao.recv()
+        if comando == 'reset':
+            conexao.send(ambiente.reset(dados))
+        elif comando == 'step':
+            conexao.send(ambiente.step(dados))
+        else:
+            conexao.close()
+            return
+
+
+class AmbienteParalelo:
+    '''Divide os ambientes entre processos, cada um com um `AmbienteVetorizado`.
+
+    As ações são repartidas entre os processos por `Pipe`, todos avançam ao mesmo tempo, e os
+    resultados são concatenados na ordem dos processos, com a mesma interface do
+    `AmbienteVetorizado`.
+
+    Atributos:
+    - `conexoes:` Pontas dos `Pipe` de cada processo;
+    - `processos:` Processos;
+    - `tamanhos:` Quantidade de ambientes de cada processo;
+    '''
+    def __init__(self, criar: Callable[[], AmbienteVetorizado], processos: int | None = None):
+        '''Método construtor.
+
+        Parâmetros:
+        - `criar:` Função (que possa ser serializada) que cria o `AmbienteVetorizado` de cada processo;
+        - `processos:` Quantidade de processos, por padrão um por núcleo (opcional);
+
+        ```
+        >>> with AmbienteParalelo(partial(AmbienteVetorizado, 1024)) as ambiente:
+        ...     observacoes = ambiente.reset(seed=0)
+        ```
+        '''
+        self.conexoes, self.processos = [], []
+        for idx in range(processos or os.cpu_count()):
+            local, remota = Pipe()
+            processo = Process(target=worker, args=(remota, criar), daemon=True)
+            processo.start()
+            remota.close()
+            self.conexoes.append(local)
+            self.processos.append(processo)
+        self.tamanhos = []
+
+    def reset(self, seed: int | None = None) -> ndarray:
+        '''Método que começa novos episódios em todos os processos e retorna as observações.
+
+        Parâmetros:
+        - `seed:` Semente; o processo `i` usa `seed + i` (opcional);
+        '''
+        for idx, conexao in enumerate(self.conexoes):
+            conexao.send(('reset', None if seed is None else seed + idx))
+        observacoes = [conexao.recv() for conexao in self.conexoes]
+        self.tamanhos = [len(observacao) for observacao in observacoes]
+        return concatenate(observacoes)
+
+    def step(self, acoes: ndarray) -> tuple:
+        '''Método que avança todos os ambientes um quadro e retorna `(observações, recompensas, fins, infos)`.
+
+        `infos` é a lista dos `info` de cada processo.
+
+        Parâmetros:
+        - `acoes:` Vetor com a ação do agente em cada ambiente;
+        '''
+        if not self.tamanhos:
+            raise ValueError('Call reset() before step().')
+        inicio = 0
+        for conexao, tamanho in zip(self.conexoes, self.tamanhos):
+            conexao.send(('step', acoes[inicio:inicio + tamanho]))
+            inicio += tamanho
+        observacoes, recompensas, fins, infos = zip(*[conexao.recv() for conexao in self.conexoes])
+        return concatenate(observacoes), concatenate(recompensas), concatenate(fins), list(infos)
+
+    def close(self):
+        '''Método que encerra os processos.'''
+        for conexao in self.conexoes:
+            conexao.send(('close', None))
+            conexao.close()
+        for processo in self.processos:
+            processo.join()
+        self.conexoes, self.processos = [], []
+
+    def __enter__(self) -> 'AmbienteParalelo':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
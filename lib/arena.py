@@ -0,0 +1,234 @@
+from numpy import ndarray, array, zeros, ones, where, sign, clip, argsort, searchsorted, repeat, arange, cumsum, unique, int64, random
+from typing import Callable
+from lib.constantes import *
+from lib.vetorizado import network_actions
+
+
+ESQUERDA, DIREITA, CIMA, BAIXO = range(4)
+'''Lados da quadra, usados em `raquete_lado` e como índice de `sofridos`.'''
+
+
+class Arena:
+    '''Uma quadra com várias bolas e várias raquetes, guardadas como arrays.
+
+    Com 2 lados, as raquetes ficam na esquerda e na direita e as bolas rebatem no topo e no chão,
+    como no jogo. Com 4 lados também há raquetes horizontais em cima e embaixo, e a bola que sai por
+    qualquer lado é um ponto sofrido por ele. Cada lado tem `raquetes_por_lado` raquetes, cada uma
+    presa a uma faixa do lado. As bolas começam espalhadas pela quadra e não colidem entre si.
+
+    As colisões usam uma fase ampla de sweep and prune: as bolas são ordenadas pela coordenada em
+    que as raquetes são finas (x para as verticais, y para as horizontais), e cada raquete só
+    testa as bolas do intervalo encontrado com busca binária. O custo fica em O(B log B + candidatos)
+    em vez de O(bolas × raquetes).
+
+    Atributos:
+    - `quantidade:` Quantidade de bolas;
+    - `lados:` 2 ou 4;
+    - `velocidade:` Velocidade das bolas em cada eixo, até 20 para não atravessarem as raquetes;
+    - `fase_ampla:` Se as colisões usam a fase ampla ou testam todos os pares;
+    - `rng:` Gerador das direções das bolas;
+    - `bola_x:` Canto esquerdo das bolas;
+    - `bola_y:` Topo das bolas;
+    - `vel_x:` Velocidades horizontais;
+    - `vel_y:` Velocidades verticais;
+    - `raquete_x:` Canto esquerdo das raquetes;
+    - `raquete_y:` Topo das raquetes;
+    - `raquete_largura:` Largura das raquetes;
+    - `raquete_altura:` Altura das raquetes;
+    - `raquete_lado:` Lado de cada raquete (`ESQUERDA`, `DIREITA`, `CIMA` ou `BAIXO`);
+    - `raquete_minimo:` Início da faixa de cada raquete, no eixo em que ela se move;
+    - `raquete_maximo:` Fim da faixa de cada raquete, no eixo em que ela se move;
+    - `vertical:` Se cada raquete é vertical (esquerda e direita) ou horizontal (cima e baixo);
+    - `sofridos:` Pontos sofridos por cada lado;
+    - `candidatos:` Pares bola-raquete testados na última colisão;
+    '''
+    def __init__(self, bolas: int = 1, raquetes_por_lado: int = 1, lados: int = 2, seed: int | None = None, velocidade: int = VELOCIDADE, fase_ampla: bool = True):
+        '''Método construtor.
+
+        Parâmetros:
+        - `bolas:` Quantidade de bolas (opcional);
+        - `raquetes_por_lado:` Raquetes em cada lado (opcional);
+        - `lados:` 2 (esquerda e direita) ou 4 (opcional);
+        - `seed:` Semente das direções das bolas (opcional);
+        - `velocidade:` Velocidade das bolas (opcional);
+        - `fase_ampla:` Usa a fase ampla nas colisões (opcional);
+
+        ```
+        >>> arena = Arena(1000, raquetes_por_lado=2, lados=4, seed=0)
+        >>> arena.simulate(600, tracking_controller)
+        ```
+        '''
+        if lados not in (2, 4):
+            raise ValueError(f'Invalid number of sides {lados}. Choose from 2, 4')
+        self.quantidade = bolas
+        self.lados = lados
+        self.velocidade = velocidade
+        self.fase_ampla = fase_ampla
+        self.rng = random.default_rng(seed)
+        self.bola_x = zeros(bolas, dtype=int64)
+        self.bola_y = zeros(bolas, dtype=int64)
+        self.vel_x = zeros(bolas, dtype=int64)
+        self.vel_y = zeros(bolas, dtype=int64)
+        self.sofridos = zeros(4, dtype=int64)
+        self.candidatos = 0
+        self.new_direction(ones(bolas, dtype=bool))
+        # Só a primeira posição é espalhada pela quadra; depois de um ponto a bola volta ao centro, como no jogo.
+        self.bola_x[:] = self.rng.integers(20, LARGURA - 30, size=bolas)
+        self.bola_y[:] = self.rng.integers(100, ALTURA - 30, size=bolas)
+
+        raquetes = []
+        for lado in range(lados):
+            vertical = lado in (ESQUERDA, DIREITA)
+            inicio, fim = (80, ALTURA) if vertical else (0, LARGURA)
+            faixa = (fim - inicio) // raquetes_por_lado
+            comprimento = min(100, faixa // 2)
+            fixo = {ESQUERDA: 0, DIREITA: LARGURA - 10, CIMA: 80, BAIXO: ALTURA - 10}[lado]
+            for idx in range(raquetes_por_lado):
+                minimo = inicio + idx * faixa
+                posicao = minimo + (faixa - comprimento) // 2
+                x, y, largura, altura = (fixo, posicao, 10, comprimento) if vertical else (posicao, fixo, comprimento, 10)
+                raquetes.append((x, y, largura, altura, lado, minimo, minimo + faixa))
+        self.raquete_x, self.raquete_y, self.raquete_largura, self.raquete_altura, self.raquete_lado, self.raquete_minimo, self.raquete_maximo = (array(valores, dtype=int64) for valores in zip(*raquetes))
+        self.vertical = self.raquete_lado <= DIREITA
+
+    def new_direction(self, mask: ndarray):
+        '''Método que recoloca bolas no centro com uma nova direção.
+
+        Parâmetros:
+        - `mask:` Bolas recolocadas;
+        '''
+        total = int(mask.sum())
+        self.bola_x[mask] = LARGURA // 2 - 5
+        self.bola_y[mask] = (ALTURA + 80) // 2 - 5
+        self.vel_x[mask] = self.rng.choice([-self.velocidade, self.velocidade], size=total)
+        self.vel_y[mask] = self.rng.choice([-self.velocidade, self.velocidade], size=total)
+
+    def paddle_centers(self) -> ndarray:
+        '''Método que retorna o centro de cada raquete no eixo em que ela se move.'''
+        return where(self.vertical, self.raquete_y + self.raquete_altura // 2, self.raquete_x + self.raquete_largura // 2)
+
+    def move_paddles(self, acoes: ndarray):
+        '''Método que move as raquetes dentro das suas faixas.
+
+        Nas raquetes horizontais, `SOBE` move para a esquerda e `DESCE` para a direita.
+
+        Parâmetros:
+        - `acoes:` Ação de cada raquete;
+        '''
+        posicao = where(self.vertical, self.raquete_y, self.raquete_x)
+        comprimento = where(self.vertical, self.raquete_altura, self.raquete_largura)
+        posicao = clip(posicao + VELOCIDADE * sign(acoes), self.raquete_minimo, self.raquete_maximo - comprimento)
+        self.raquete_y = where(self.vertical, posicao, self.raquete_y)
+        self.raquete_x = where(self.vertical, self.raquete_x, posicao)
+
+    def collide(self) -> tuple[ndarray, ndarray]:
+        '''Método que retorna quais bolas encostam em uma raquete vertical e quais encostam em uma horizontal.'''
+        tocou_x, tocou_y = zeros(self.quantidade, dtype=bool), zeros(self.quantidade, dtype=bool)
+        self.candidatos = 0
+        for vertical, tocou in ((True, tocou_x), (False, tocou_y)):
+            raquetes = (self.vertical == vertical).nonzero()[0]
+            if not len(raquetes):
+                continue
+            if not self.fase_ampla:
+                bolas = repeat(arange(self.quantidade), len(raquetes))
+                raquetes = raquetes[arange(len(bolas)) % len(raquetes)]
+            else:
+                # Na coordenada fina da raquete, só as bolas de um intervalo da ordem podem encostar nela.
+                coordenada, inicio, fim = (self.bola_x, self.raquete_x - 10, self.raquete_x + self.raquete_largura) if vertical else (self.bola_y, self.raquete_y - 10, self.raquete_y + self.raquete_altura)
+                ordem = argsort(coordenada, kind='stable')
+                ordenadas = coordenada[ordem]
+                primeiros = searchsorted(ordenadas, inicio[raquetes], 'right')
+                tamanhos = searchsorted(ordenadas, fim[raquetes], 'left') - primeiros
+                tamanhos[tamanhos < 0] = 0
+                deslocamentos = cumsum(tamanhos) - tamanhos
+                bolas = ordem[arange(int(tamanhos.sum())) - repeat(deslocamentos - primeiros, tamanhos)]
+                raquetes = repeat(raquetes, tamanhos)
+            self.candidatos += len(bolas)
+            x, y = self.bola_x[bolas], self.bola_y[bolas]
+            encostou = ((x < self.raquete_x[raquetes] + self.raquete_largura[raquetes]) & (self.raquete_x[raquetes] < x + 10)
+                        & (y < self.raquete_y[raquetes] + self.raquete_altura[raquetes]) & (self.raquete_y[raquetes] < y + 10))
+            tocou[bolas[encostou]] = True
+        return tocou_x, tocou_y
+
+    def step(self, acoes: ndarray):
+        '''Método que avança a arena um quadro: raquetes, bolas, pontos e colisões.
+
+        Parâmetros:
+        - `acoes:` Ação de cada raquete;
+        '''
+        self.move_paddles(acoes)
+        self.bola_x += self.vel_x
+        self.bola_y += self.vel_y
+        if self.lados == 2:
+            bounce = (self.bola_y + self.vel_y < 80) | (self.bola_y + 10 + self.vel_y > ALTURA)
+            self.vel_y[bounce] *= -1
+
+        saidas = [self.bola_x + 10 < 0, self.bola_x > LARGURA]
+        if self.lados == 4:
+            saidas += [self.bola_y + 10 < 80, self.bola_y > ALTURA]
+        fora = zeros(self.quantidade, dtype=bool)
+        for lado, saiu in enumerate(saidas):
+            self.sofridos[lado] += saiu.sum()
+            fora |= saiu
+        if fora.any():
+            self.new_direction(fora)
+
+        tocou_x, tocou_y = self.collide()
+        self.vel_x[tocou_x] *= -1
+        self.vel_y[tocou_y] *= -1
+
+    def targets(self) -> ndarray:
+        '''Método que retorna, para cada raquete, o centro (no eixo dela) da bola que vai chegar primeiro à sua faixa.
+
+        Só contam as bolas indo em direção ao lado da raquete; sem nenhuma, o alvo é o centro da raquete.
+        '''
+        alvos = self.paddle_centers()
+        distancias = (self.bola_x, LARGURA - self.bola_x, self.bola_y - 80, ALTURA - self.bola_y)
+        indo = (self.vel_x < 0, self.vel_x > 0, self.vel_y < 0, self.vel_y > 0)
+        for lado in range(self.lados):
+            raquetes = (self.raquete_lado == lado).nonzero()[0]
+            bolas = indo[lado].nonzero()[0]
+            if not len(bolas):
+                continue
+            bolas = bolas[argsort(distancias[lado][bolas], kind='stable')]
+            centros = (self.bola_y if lado <= DIREITA else self.bola_x)[bolas] + 5
+            inicio, fim = self.raquete_minimo[raquetes[0]], self.raquete_maximo[raquetes[-1]]
+            faixas = clip((centros - inicio) * len(raquetes) // (fim - inicio), 0, len(raquetes) - 1)
+            # `unique` retorna a primeira ocorrência de cada faixa, a bola mais próxima dela.
+            faixas, primeiras = unique(faixas, return_index=True)
+            alvos[raquetes[faixas]] = centros[primeiras]
+        return alvos
+
+    def simulate(self, frames: int, controlador: Callable[['Arena'], ndarray]):
+        '''Método que avança a arena vários quadros.
+
+        Parâmetros:
+        - `frames:` Quantidade de quadros;
+        - `controlador:` Função `(arena) -> ações` de todas as raquetes;
+        '''
+        for frame in range(frames):
+            self.step(controlador(self))
+
+
+def tracking_controller(arena: Arena) -> ndarray:
+    '''Controlador simples em que cada raquete segue o seu alvo (`Arena.targets`).
+
+    Parâmetros:
+    - `arena:` Arena;
+    '''
+    return sign(arena.targets() - arena.paddle_centers())
+
+
+def network_controller(rede) -> Callable[[Arena], ndarray]:
+    '''Função que cria um controlador que decide as ações de todas as raquetes com uma chamada em lote.
+
+    A entrada de cada raquete é a distância até o seu alvo, como a do `PlayerIA`.
+
+    Parâmetros:
+    - `rede:` `Network` ou `CompiledNetwork` com uma entrada;
+    '''
+    if rede.get_inputs() != 1:
+        raise ValueError(f'The arena controller needs a network with 1 input, got {rede.get_inputs()}.')
+    def controlador(arena: Arena) -> ndarray:
+        return network_actions(rede.forward_batch((arena.paddle_centers() - arena.targets())[:, None]))
+    return controlador
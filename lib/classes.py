@@ -1,101 +1,92 @@
-import pygame, json
-from random import choice
+import json, random
 from lib.rede_neural import Network
+from lib.simulacao import Simulacao, Raquete, BolaSimulada, network_action, network_inputs, SOBE, PARADO, DESCE
+from lib.trajetoria import Preditor
+from lib.perfil import Perfilador, secao
+from lib.texto import CacheTexto
 from lib.constantes import *
 
 
-class Player:
+class Player(Raquete):
     '''Classe que representa o jogador.
     
     Atributos:
     - `rect:` Retângulo tanto de colisão como de exibição;
     '''
-    def __init__(self, pos: tuple):
-        '''Método construtor.
-        
+    def keyboard_action(self, keys) -> int:
+        '''Método que converte as teclas pressionadas em uma ação.
+
         Parâmetros:
-        - `pos:` Posição que o jogador ficará;
+        - `keys:` Estado do teclado (`pygame.key.get_pressed()`);
         '''
-        self.rect = pygame.Rect(*pos, 10, 100)
-    
+        import pygame
+        if not (keys[pygame.K_UP] and keys[pygame.K_DOWN]):
+            if keys[pygame.K_UP]:
+                return SOBE
+            elif keys[pygame.K_DOWN]:
+                return DESCE
+        return PARADO
+
     def update(self):
         '''Método que atualiza o jogador.'''
-        keys = pygame.key.get_pressed()
-        if not (keys[pygame.K_UP] and keys[pygame.K_DOWN]):
-            if keys[pygame.K_UP] and self.rect.top > 80:
-                self.rect.y -= VELOCIDADE
-            elif keys[pygame.K_DOWN] and self.rect.bottom < ALTURA:
-                self.rect.y += VELOCIDADE
+        import pygame
+        self.move(self.keyboard_action(pygame.key.get_pressed()))
     
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: 'pygame.Surface'):
         '''Método para a exibição do jogador.
         
         Parâmetros:
         - `screen:` Tela do jogo;
         '''
-        pygame.draw.rect(screen, 'white', self.rect)
+        import pygame
+        pygame.draw.rect(screen, 'white', self.rect.to_tuple())
 
 
 class PlayerIA(Player):
-    '''Subclasse de `Player` que representa do bot.'''
-    def __init__(self, pos: tuple):
-        super().__init__(pos)
+    '''Subclasse de `Player` que representa do bot.
+
+    Atributos:
+    - `rede:` Rede neural compilada do `network.json`;
+    - `preditor:` `Preditor` da altura em que a bola vai chegar, usado por redes com duas entradas, ou `None`;
+    '''
+    def __init__(self, pos: tuple, seed: int | None = None, hz: int = FISICA_HZ, continua: bool = False):
+        super().__init__(pos, hz)
         with open(os.path.join(DIRETORIO_PRINCIPAL, 'network.json'), 'r') as file:
-            self.rede = Network(**json.load(file))
+            self.rede = Network(**json.load(file), seed=seed).compile()
+        self.preditor = Preditor(1 if self.rect.centerx < LARGURA // 2 else 2, continua) if self.rede.get_inputs() == 2 else None
+
+    def decide(self, bola: BolaSimulada) -> int:
+        '''Método que decide a ação da rede para a posição da bola.
+
+        Parâmetros:
+        - `bola:` Bola;
+        '''
+        return network_action(self.rede.forward(network_inputs(self, bola, self.preditor)))
     
-    def update(self, parametro: int):
-        action = self.rede.forward([self.rect.centery - parametro])
-        if not all(action):
-            if action[0] and self.rect.top > 80:
-                self.rect.y -= VELOCIDADE
-            if action[1] and self.rect.bottom < ALTURA:
-                self.rect.y += VELOCIDADE
+    def update(self, bola: BolaSimulada):
+        self.move(self.decide(bola))
 
 
-class Bola:
+class Bola(BolaSimulada):
     '''Classe que representa a bola.
     
     Atributos:
     - `rect:` Retângulo tanto de colisão como de exibição;
-    - `vel_x:` Velocidade na horizontal;
-    - `vel_y:` Velocidade na vertical;
+    - `vel_x:` Deslocamento horizontal em cada passo da física;
+    - `vel_y:` Deslocamento vertical em cada passo da física;
     '''
-    def __init__(self, pos: tuple):
-        '''Método construtor.
-        
-        Parâmetros:
-        - `pos:` Posição inical da bola;
-        '''
-        self.rect = pygame.Rect(0, 0, 10, 10)
-        self.new_direction(pos)
-    
-    def new_direction(self, pos: tuple):
-        '''Método que define uma nova posição e direção para a bola.
-        
-        Parâmetros:
-        - `pos:` Nova posição;
-        '''
-        self.rect.center = pos
-        self.vel_x, self.vel_y = choice([-VELOCIDADE, VELOCIDADE]), choice([-VELOCIDADE, VELOCIDADE])
-    
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: 'pygame.Surface'):
         '''Método que desenha a bola.
         
         Parâmetros:
         - `screen:` Tela do jogo;
         '''
-        pygame.draw.rect(screen, 'white', self.rect)
-    
-    def update(self):
-        '''Método que atualiza do jogo.'''
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-        if self.rect.top + self.vel_y < 80 or self.rect.bottom + self.vel_y > ALTURA:
-            self.vel_y *= -1
+        import pygame
+        pygame.draw.rect(screen, 'white', self.rect.to_tuple())
 
 
-class Game:
-    '''Classe que controla o jogo em si.
+class Game(Simulacao):
+    '''Classe que desenha o jogo, avançando a `Simulacao` com o teclado e a rede neural.
     
     Atributos:
     - `screen:` Tela do jogo;
@@ -105,67 +96,77 @@ class Game:
     - `jogador1_pontos:` Pontos do primeiro jogador;
     - `jogador2_pontos:` Pontos do segundo jogador;
     - `start:` Se o jogo começou ou não;
+    - `continua:` Se a bola usa colisão contínua;
+    - `hz:` Passos da física por segundo;
+    - `perfil:` Perfilador que mede as seções do quadro, ou `None`;
+    - `textos:` Cache de fontes e textos renderizados;
+    - `gravador:` `GravadorDataset` que recebe o estado e a ação das duas raquetes, ou `None`;
     '''
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: 'pygame.Surface', perfil: Perfilador | None = None, seed: int | None = None, velocidade: int = VELOCIDADE_BOLA, continua: bool = False, hz: int = FISICA_HZ):
         '''Método construtor.
 
         Parâmetros:
         - `screen:` Tela do jogo;
+        - `perfil:` Perfilador (opcional);
+        - `seed:` Semente da partida, para ela poder ser reproduzida (opcional);
+        - `velocidade:` Velocidade da bola, em pixels por segundo (opcional);
+        - `continua:` Usa colisão contínua (opcional);
+        - `hz:` Passos da física por segundo (opcional);
         '''
+        rng = random.Random(seed) if seed is not None else None
+        super().__init__(Player((0, 290), hz), PlayerIA((LARGURA - 10, 290), seed, hz, continua), Bola((LARGURA // 2, (ALTURA + 80) // 2), rng, velocidade, hz), seed, continua=continua, hz=hz)
         self.screen = screen
-        self.jogador1 = Player((0, 290))
-        self.jogador2 = PlayerIA((LARGURA - 10, 290))
-        self.bola = Bola((LARGURA // 2, (ALTURA + 80) // 2))
-        self.jogador1_pontos = 0
-        self.jogador2_pontos = 0
-        self.start = False
+        self.perfil = perfil
+        self.textos = CacheTexto()
+        self.gravador = None
     
     def draw_text(self):
         '''Método que desenha os textos do jogo.'''
-        font1 = pygame.font.SysFont('04b19', 200)
-        font2 = pygame.font.SysFont('04b19', 35)
-        pontos_1 = font1.render(str(self.jogador1_pontos), True, '#303030')
-        pontos_2 = font1.render(str(self.jogador2_pontos), True, '#303030')
-        player = font2.render('Player', True, 'white')
-        neural_network = font2.render('Neural Network', True, 'white')
-        self.screen.blit(pontos_1, pontos_1.get_rect(center=(LARGURA / 4, (ALTURA + 80) / 2)))
-        self.screen.blit(pontos_2, pontos_2.get_rect(center=(3 * LARGURA / 4, (ALTURA + 80) / 2)))
-        self.screen.blit(player, player.get_rect(center=(LARGURA / 4, 40)))
-        self.screen.blit(neural_network, neural_network.get_rect(center=(3 * LARGURA / 4, 40)))
+        self.textos.blit(self.screen, str(self.jogador1_pontos), 200, '#303030', (LARGURA / 4, (ALTURA + 80) / 2))
+        self.textos.blit(self.screen, str(self.jogador2_pontos), 200, '#303030', (3 * LARGURA / 4, (ALTURA + 80) / 2))
+        self.textos.blit(self.screen, 'Player', 35, 'white', (LARGURA / 4, 40))
+        self.textos.blit(self.screen, 'Neural Network', 35, 'white', (3 * LARGURA / 4, 40))
     
     def draw(self):
         '''Método que desenha o jogo.'''
-        pygame.draw.line(self.screen, 'white', (0, 80), (LARGURA, 80))
-        pygame.draw.line(self.screen, 'white', (LARGURA / 2, 0), (LARGURA / 2, 80))
-        self.draw_text()
-        self.jogador1.draw(self.screen)
-        self.jogador2.draw(self.screen)
-        self.bola.draw(self.screen)
+        import pygame
+        with secao(self.perfil, 'desenho'):
+            pygame.draw.line(self.screen, 'white', (0, 80), (LARGURA, 80))
+            pygame.draw.line(self.screen, 'white', (LARGURA / 2, 0), (LARGURA / 2, 80))
+        with secao(self.perfil, 'texto'):
+            self.draw_text()
+        with secao(self.perfil, 'desenho'):
+            self.jogador1.draw(self.screen)
+            self.jogador2.draw(self.screen)
+            self.bola.draw(self.screen)
 
-    def update(self):
-        '''Método que atualiza o jogo.'''
-        self.jogador1.update()
-        self.jogador2.update(self.bola.rect.centery)
-        if any(pygame.key.get_pressed()):
-            self.start = True
-        if self.start:
-            self.bola.update()
-        
-        if self.bola.rect.right < 0:
-            self.start = False
-            self.bola.new_direction((LARGURA // 2, (ALTURA + 80) // 2))
-            self.jogador2_pontos += 1
-            self.jogador1.rect.centery = (ALTURA + 80) // 2
-        elif self.bola.rect.left > LARGURA:
-            self.start = False
-            self.bola.new_direction((LARGURA // 2, (ALTURA + 80) // 2))
-            self.jogador1_pontos += 1
-            self.jogador1.rect.centery = (ALTURA + 80) // 2
-        
-        if self.jogador1.rect.colliderect(self.bola.rect) or self.jogador2.rect.colliderect(self.bola.rect):
-            self.bola.vel_x *= -1
+    def update(self, entrada: tuple | None = None) -> tuple:
+        '''Método que avança o jogo um passo da física e retorna a entrada usada nele.
+
+        Parâmetros:
+        - `entrada:` `(ação, iniciar)` do jogador, ex.: vinda de um replay; sem ela o teclado é lido (opcional);
+        '''
+        if entrada is None:
+            import pygame
+            keys = pygame.key.get_pressed()
+            entrada = self.jogador1.keyboard_action(keys), any(keys)
+        with secao(self.perfil, 'ia'):
+            acao2 = self.jogador2.decide(self.bola)
+        if self.gravador is not None:
+            self.gravador.record(1, self.jogador1, self.bola, entrada[0])
+            self.gravador.record(2, self.jogador2, self.bola, acao2)
+        with secao(self.perfil, 'fisica'):
+            self.update_physics(entrada[0], acao2, entrada[1])
+        with secao(self.perfil, 'colisao'):
+            self.check_collision()
+        return entrada
+
+    def run(self, entrada: tuple | None = None) -> tuple:
+        '''Método que executa o jogo e retorna a entrada usada no quadro.
 
-    def run(self):
-        '''Método que executa o jogo.'''
-        self.update()
+        Parâmetros:
+        - `entrada:` `(ação, iniciar)` do jogador (opcional);
+        '''
+        entrada = self.update(entrada)
         self.draw()
+        return entrada
@@ -3,6 +3,10 @@ import os
 
 LARGURA, ALTURA = 800, 600
 FPS = 60
+FISICA_HZ = 60
+ATRASO_MAXIMO = 0.25
 VELOCIDADE = 5
+VELOCIDADE_RAQUETE = VELOCIDADE * FISICA_HZ
+VELOCIDADE_BOLA = VELOCIDADE * FISICA_HZ
 
 DIRETORIO_PRINCIPAL = os.path.dirname(__file__)
@@ -0,0 +1,164 @@
+import glob, os, re
+from numpy import ndarray, array, empty, zeros, concatenate, float32, float64, int8, load, save, random
+from lib.simulacao import Raquete, BolaSimulada, SOBE, DESCE
+
+
+COLUNAS = ('lado', 'distancia', 'bola_x', 'bola_y', 'vel_x', 'vel_y', 'raquete_y')
+'''Colunas do estado gravado em cada amostra. `distancia` é a entrada usada pelo `PlayerIA`.'''
+
+
+def state(lado: int, raquete: Raquete, bola: BolaSimulada) -> list:
+    '''Função que monta o estado de uma raquete no formato de `COLUNAS`.
+
+    Parâmetros:
+    - `lado:` 1 para a esquerda, 2 para a direita;
+    - `raquete:` Raquete;
+    - `bola:` Bola;
+    '''
+    return [lado, raquete.rect.centery - bola.rect.centery, bola.rect.centerx, bola.rect.centery, bola.vel_x, bola.vel_y, raquete.rect.centery]
+
+
+def action_targets(acoes: ndarray) -> ndarray:
+    '''Função que converte ações em saídas esperadas da rede (sobe, desce), como lidas pelo `network_action`.
+
+    Parâmetros:
+    - `acoes:` Vetor de ações;
+    '''
+    return array([acoes == SOBE, acoes == DESCE], dtype=float64).T
+
+
+class GravadorDataset:
+    '''Grava amostras (estado, ação) em pedaços de arquivos `.npy` que só são acrescentados.
+
+    As amostras ficam em um buffer pré-alocado; quando ele enche, um novo par
+    `estados_NNNNNN.npy`/`acoes_NNNNNN.npy` é escrito no diretório. Arquivos existentes nunca
+    são reescritos, então várias sessões podem gravar no mesmo diretório.
+
+    Atributos:
+    - `diretorio:` Diretório do dataset;
+    - `tamanho_chunk:` Amostras por arquivo;
+    - `chunks:` Número do próximo arquivo a tentar;
+    - `estados:` Buffer de estados (privado);
+    - `acoes:` Buffer de ações (privado);
+    - `total:` Amostras no buffer (privado);
+    '''
+    def __init__(self, diretorio: str, tamanho_chunk: int = 65536):
+        '''Método construtor.
+
+        Parâmetros:
+        - `diretorio:` Diretório do dataset, criado se não existir;
+        - `tamanho_chunk:` Amostras por arquivo (opcional);
+        '''
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.tamanho_chunk = tamanho_chunk
+        numeros = [int(re.search(r'(\d+)\.npy$', path).group(1)) for path in glob.glob(os.path.join(diretorio, 'estados_*.npy'))]
+        self.chunks = max(numeros, default=-1) + 1
+        self.__estados = empty((tamanho_chunk, len(COLUNAS)), dtype=float32)
+        self.__acoes = empty(tamanho_chunk, dtype=int8)
+        self.__total = 0
+
+    def append(self, estado: list, acao: int):
+        '''Método que acrescenta uma amostra.
+
+        Parâmetros:
+        - `estado:` Estado no formato de `COLUNAS`;
+        - `acao:` Ação tomada;
+        '''
+        self.__estados[self.__total] = estado
+        self.__acoes[self.__total] = acao
+        self.__total += 1
+        if self.__total == self.tamanho_chunk:
+            self.flush()
+
+    def append_batch(self, estados: ndarray, acoes: ndarray):
+        '''Método que acrescenta várias amostras de uma vez.
+
+        Parâmetros:
+        - `estados:` Matriz (N, colunas) de estados;
+        - `acoes:` Vetor de ações;
+        '''
+        inicio = 0
+        while inicio < len(acoes):
+            quantidade = min(len(acoes) - inicio, self.tamanho_chunk - self.__total)
+            self.__estados[self.__total:self.__total + quantidade] = estados[inicio:inicio + quantidade]
+            self.__acoes[self.__total:self.__total + quantidade] = acoes[inicio:inicio + quantidade]
+            self.__total += quantidade
+            inicio += quantidade
+            if self.__total == self.tamanho_chunk:
+                self.flush()
+
+    def record(self, lado: int, raquete: Raquete, bola: BolaSimulada, acao: int):
+        '''Método que grava o estado de uma raquete e a ação tomada nele.
+
+        Parâmetros:
+        - `lado:` 1 para a esquerda, 2 para a direita;
+        - `raquete:` Raquete;
+        - `bola:` Bola;
+        - `acao:` Ação tomada;
+        '''
+        self.append(state(lado, raquete, bola), acao)
+
+    def flush(self):
+        '''Método que escreve as amostras do buffer em um novo par de arquivos.
+
+        O número do par é reservado ao criar o arquivo de estados em modo exclusivo; se outra
+        sessão já tiver criado esse número, o próximo é tentado.
+        '''
+        if not self.__total:
+            return
+        while True:
+            try:
+                file = open(os.path.join(self.diretorio, f'estados_{self.chunks:06d}.npy'), 'xb')
+                break
+            except FileExistsError:
+                self.chunks += 1
+        with file:
+            save(file, self.__estados[:self.__total])
+        with open(os.path.join(self.diretorio, f'acoes_{self.chunks:06d}.npy'), 'xb') as file:
+            save(file, self.__acoes[:self.__total])
+        self.chunks += 1
+        self.__total = 0
+
+    def close(self):
+        '''Método que grava as amostras restantes.'''
+        self.flush()
+
+
+def batches(diretorio: str, batch_size: int = 256, colunas: tuple = ('distancia',), chunks_em_memoria: int = 4, shuffle: bool = True, seed: int | None = None):
+    '''Gerador de mini-lotes `(X, Y)` embaralhados, lendo o dataset aos poucos.
+
+    A ordem dos arquivos é embaralhada, e as amostras são embaralhadas dentro de uma janela de
+    `chunks_em_memoria` arquivos, então a memória usada não depende do tamanho do dataset. `Y`
+    está no formato de `action_targets`, pronto para `Network.fit_batches` ou `backpropagation`.
+
+    Parâmetros:
+    - `diretorio:` Diretório do dataset;
+    - `batch_size:` Tamanho dos lotes (opcional);
+    - `colunas:` Colunas de `COLUNAS` usadas como entrada (opcional);
+    - `chunks_em_memoria:` Arquivos carregados ao mesmo tempo (opcional);
+    - `shuffle:` Se os arquivos e as amostras são embaralhados (opcional);
+    - `seed:` Semente do embaralhamento (opcional);
+
+    ```
+    >>> rede.fit_batches(batches('dados/', 128), learning_rate=0.01)
+    ```
+    '''
+    rng = random.default_rng(seed)
+    indices = [COLUNAS.index(coluna) for coluna in colunas]
+    paths = sorted(glob.glob(os.path.join(diretorio, 'estados_*.npy')))
+    if shuffle:
+        paths = [paths[idx] for idx in rng.permutation(len(paths))]
+    X, acoes = zeros((0, len(indices))), zeros(0, dtype=int8)
+    for inicio in range(0, len(paths), chunks_em_memoria):
+        grupo = paths[inicio:inicio + chunks_em_memoria]
+        X = concatenate([X] + [load(path, mmap_mode='r')[:, indices].astype(float64) for path in grupo])
+        acoes = concatenate([acoes] + [load(path.replace('estados_', 'acoes_'), mmap_mode='r') for path in grupo])
+        if shuffle:
+            ordem = rng.permutation(len(acoes))
+            X, acoes = X[ordem], acoes[ordem]
+        ultimo = inicio + chunks_em_memoria >= len(paths)
+        fim = len(acoes) if ultimo else len(acoes) - len(acoes) % batch_size
+        for posicao in range(0, fim, batch_size):
+            yield X[posicao:posicao + batch_size], action_targets(acoes[posicao:posicao + batch_size])
+        X, acoes = X[fim:], acoes[fim:]
@@ -0,0 +1,122 @@
+import csv, json
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from numpy import zeros, percentile
+
+
+SECOES = ('eventos', 'ia', 'fisica', 'colisao', 'texto', 'desenho', 'flip')
+'''Seções medidas em cada quadro do jogo.'''
+
+
+class Perfilador:
+    '''Registra o tempo de cada seção do quadro em um buffer circular.
+
+    Atributos:
+    - `secoes:` Nomes das seções;
+    - `capacidade:` Quantidade de quadros guardados no buffer;
+    - `tempos:` Matriz (capacidade, seções) com os tempos em segundos;
+    - `quadros:` Quantidade de quadros registrados desde o início;
+    - `overlay:` Se as estatísticas são desenhadas na tela;
+    '''
+    def __init__(self, capacidade: int = 600, secoes: tuple = SECOES, overlay: bool = True):
+        '''Método construtor.
+
+        Parâmetros:
+        - `capacidade:` Quantidade de quadros guardados no buffer (opcional);
+        - `secoes:` Nomes das seções (opcional);
+        - `overlay:` Se as estatísticas são desenhadas na tela (opcional);
+        '''
+        self.secoes = secoes
+        self.capacidade = capacidade
+        self.tempos = zeros((capacidade, len(secoes)))
+        self.quadros = 0
+        self.overlay = overlay
+        self.__indices = {nome: idx for idx, nome in enumerate(secoes)}
+        self.__estatisticas = {}
+        self.__fonte = None
+
+    @contextmanager
+    def secao(self, nome: str):
+        '''Contexto que soma o tempo gasto dentro dele à seção do quadro atual.
+
+        Parâmetros:
+        - `nome:` Nome da seção;
+
+        ```
+        >>> with perfil.secao('ia'):
+        ...     acao = rede.forward(entrada)
+        ```
+        '''
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[self.quadros % self.capacidade, self.__indices[nome]] += perf_counter() - inicio
+
+    def next_frame(self):
+        '''Método que fecha o quadro atual e começa o próximo.'''
+        self.quadros += 1
+        self.tempos[self.quadros % self.capacidade] = 0
+        if self.quadros % 30 == 0:
+            self.__estatisticas = self.statistics()
+
+    def history(self):
+        '''Método que retorna os tempos dos quadros completos guardados, do mais antigo ao mais novo.'''
+        if self.quadros < self.capacidade:
+            return self.tempos[:self.quadros]
+        atual = self.quadros % self.capacidade
+        return self.tempos[list(range(atual + 1, self.capacidade)) + list(range(atual))]
+
+    def statistics(self) -> dict:
+        '''Método que retorna o p50 e o p99 (em milissegundos) de cada seção e do total do quadro.'''
+        tempos = self.history()
+        if not len(tempos):
+            return {}
+        estatisticas = {}
+        for nome, coluna in list(zip(self.secoes, tempos.T)) + [('total', tempos.sum(axis=1))]:
+            p50, p99 = percentile(coluna, [50, 99]) * 1000
+            estatisticas[nome] = {'p50': float(p50), 'p99': float(p99)}
+        return estatisticas
+
+    def draw(self, screen) -> list:
+        '''Método que desenha o p50/p99 de cada seção no canto da tela e retorna as áreas desenhadas.
+
+        Parâmetros:
+        - `screen:` Tela do jogo;
+        '''
+        if not self.overlay:
+            return []
+        import pygame
+        if self.__fonte is None:
+            self.__fonte = pygame.font.Font(None, 18)
+        areas = []
+        for idx, (nome, valores) in enumerate(self.__estatisticas.items()):
+            texto = self.__fonte.render(f'{nome:<8} p50 {valores["p50"]:6.2f} ms  p99 {valores["p99"]:6.2f} ms', True, '#00ff00')
+            areas.append(screen.blit(texto, (90, 90 + idx * 14)))
+        return areas
+
+    def dump(self, path: str):
+        '''Método que salva o histórico de quadros em CSV ou, com extensão `.json`, também as estatísticas.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        '''
+        tempos = self.history()
+        if path.endswith('.json'):
+            with open(path, 'w') as file:
+                json.dump({'secoes': list(self.secoes), 'estatisticas': self.statistics(), 'quadros': (tempos * 1000).tolist()}, file)
+            return
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow([f'{nome}_ms' for nome in self.secoes])
+            writer.writerows((tempos * 1000).tolist())
+
+
+def secao(perfil: Perfilador | None, nome: str):
+    '''Função que retorna o contexto da seção, ou um contexto vazio quando não há perfilador.
+
+    Parâmetros:
+    - `perfil:` Perfilador ou `None`;
+    - `nome:` Nome da seção;
+    '''
+    return perfil.secao(nome) if perfil is not None else nullcontext()
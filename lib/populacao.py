@@ -0,0 +1,135 @@
+from multiprocessing import shared_memory
+from numpy import ndarray, zeros, float64
+from lib.rede_neural import CompiledNetwork
+
+
+def parameter_layout(structure: list[dict]) -> list[tuple]:
+    '''Função que retorna onde fica cada array de uma camada no vetor de `Network.get_parameters`.
+
+    Cada item é `(pesos, bias, pesos ocultos)`, com `pesos` sendo `(início, formato)`, `bias`
+    sendo `(início, tamanho)` e `pesos ocultos` sendo `(início, tamanho)` ou `None` nas camadas
+    não recorrentes.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    '''
+    layout, start = [], 0
+    for anterior, layer in zip(structure, structure[1:]):
+        entradas, neurons = anterior['numbers_of_neurons'], layer['numbers_of_neurons']
+        weights = (start, (entradas, neurons))
+        start += entradas * neurons
+        biases = (start, neurons)
+        start += neurons
+        hidden_weights = None
+        if layer.get('recurrent'):
+            hidden_weights = (start, neurons)
+            start += neurons
+        layout.append((weights, biases, hidden_weights))
+    return layout
+
+
+def count_parameters(structure: list[dict]) -> int:
+    '''Função que retorna a quantidade de parâmetros de uma rede, o tamanho do vetor de `Network.get_parameters`.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    '''
+    total = 0
+    for anterior, layer in zip(structure, structure[1:]):
+        total += (anterior['numbers_of_neurons'] + (2 if layer.get('recurrent') else 1)) * layer['numbers_of_neurons']
+    return total
+
+
+class PopulacaoCompartilhada:
+    '''Parâmetros de uma população de redes em um único bloco de `multiprocessing.shared_memory`.
+
+    O bloco é uma matriz (população, parâmetros) em float64, com uma linha por rede no formato de
+    `Network.get_parameters`. Os processos se conectam ao bloco pelo nome e montam
+    `CompiledNetwork` cujos arrays são visões da linha, sem cópia. Assim, só o índice de cada rede
+    é enviado aos processos, e o processo principal escreve a próxima geração em `genomes` sem
+    reenviar nada.
+
+    Atributos:
+    - `structure:` Estrutura das redes;
+    - `populacao:` Quantidade de redes;
+    - `nome:` Nome do bloco, usado por `attach`;
+    - `genomes:` Matriz (população, parâmetros) no bloco compartilhado;
+    - `memoria:` Bloco de memória compartilhada (privado);
+    - `dono:` Se este objeto criou o bloco e deve removê-lo (privado);
+    '''
+    def __init__(self, structure: list[dict], populacao: int, nome: str | None = None):
+        '''Método construtor: cria um bloco novo, zerado, ou se conecta a um existente.
+
+        Parâmetros:
+        - `structure:` Estrutura das redes;
+        - `populacao:` Quantidade de redes;
+        - `nome:` Nome de um bloco criado por outro processo (opcional);
+
+        ```
+        >>> with PopulacaoCompartilhada(structure, 1024) as populacao:
+        ...     populacao.genomes[:] = genomes
+        ```
+        '''
+        self.structure = structure
+        self.populacao = populacao
+        tamanho = populacao * count_parameters(structure) * 8
+        self.__dono = nome is None
+        self.__memoria = shared_memory.SharedMemory(nome, create=self.__dono, size=max(tamanho, 1))
+        if self.__memoria.size < tamanho:
+            raise ValueError(f'Shared memory block "{nome}" holds {self.__memoria.size} bytes, expected {tamanho}.')
+        self.nome = self.__memoria.name
+        self.genomes = ndarray((populacao, count_parameters(structure)), dtype=float64, buffer=self.__memoria.buf)
+        if self.__dono:
+            self.genomes[:] = 0
+
+    @classmethod
+    def attach(cls, structure: list[dict], populacao: int, nome: str) -> 'PopulacaoCompartilhada':
+        '''Método que se conecta a um bloco criado em outro processo.
+
+        Parâmetros:
+        - `structure:` Estrutura das redes;
+        - `populacao:` Quantidade de redes;
+        - `nome:` Nome do bloco (`populacao.nome` no processo que o criou);
+        '''
+        return cls(structure, populacao, nome)
+
+    def __len__(self) -> int:
+        return self.populacao
+
+    def network(self, idx: int) -> CompiledNetwork:
+        '''Método que retorna a rede de uma linha como `CompiledNetwork`, com os arrays sendo visões do bloco.
+
+        Mudanças feitas em `genomes` (ex.: uma nova geração) aparecem na rede sem recompilar.
+
+        Parâmetros:
+        - `idx:` Índice da rede;
+        '''
+        if not 0 <= idx < self.populacao:
+            raise ValueError(f'Invalid index {idx} for a population of {self.populacao}.')
+        genome = self.genomes[idx]
+        weights, biases, hidden_weights = [], [], []
+        for layer, ((inicio, formato), (bias, neurons), ocultos) in zip(self.structure[1:], parameter_layout(self.structure)):
+            weights.append(genome[inicio:inicio + formato[0] * formato[1]].reshape(formato))
+            # Com 'none' o neurônio subtrai o próprio bias, então ele não tem efeito na saída.
+            biases.append(zeros(neurons) if layer['activation_function'] == 'none' else genome[bias:bias + neurons])
+            hidden_weights.append(None if ocultos is None else genome[ocultos[0]:ocultos[0] + ocultos[1]])
+        return CompiledNetwork(weights, biases, [layer['activation_function'] for layer in self.structure[1:]], hidden_weights)
+
+    def close(self):
+        '''Método que desconecta este processo do bloco e, no processo que o criou, remove o bloco.
+
+        As redes de `network` deixam de valer e não podem mais estar em uso.
+        '''
+        if self.__memoria is None:
+            return
+        self.genomes = None
+        self.__memoria.close()
+        if self.__dono:
+            self.__memoria.unlink()
+        self.__memoria = None
+
+    def __enter__(self) -> 'PopulacaoCompartilhada':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
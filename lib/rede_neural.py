@@ -1,6 +1,77 @@
-from numpy import exp, log, tanh, dot, array, random, sqrt, int64, float64
-from typing import Literal, Callable
+from numpy import exp, log, tanh, dot, array, sqrt, integer, floating, float32, float64, int8, maximum, where, zeros, ones_like, arange, concatenate, ndarray, memmap, uint8, dtype as numpy_dtype
+from typing import Literal, Callable, TYPE_CHECKING
 from random import gauss
+import json, numpy, struct
+
+if TYPE_CHECKING:
+    import numpy.random
+
+
+BINARY_MAGIC = b'PONGNET\x01'
+'''Assinatura do formato binário de redes (`Network.save`).'''
+
+BINARY_ALIGNMENT = 64
+'''Alinhamento, em bytes, de cada array dentro do arquivo binário.'''
+
+
+def sigmoid(x):
+    '''Função sigmoide vetorizada.'''
+    return 1 / (1 + exp(-x))
+
+
+def sigmoid_derivative(x):
+    '''Derivada da sigmoide.'''
+    sigmoid_x = sigmoid(x)
+    return sigmoid_x * (1 - sigmoid_x)
+
+
+def swish_derivative(x):
+    '''Derivada da swish.'''
+    sigmoid_x = sigmoid(x)
+    return sigmoid_x + x * sigmoid_x * (1 - sigmoid_x)
+
+
+ACTIVATION_FUNCTIONS = {
+    'none': (lambda x: x, lambda x: ones_like(x, dtype=float64)),
+    'sigmoid': (sigmoid, sigmoid_derivative),
+    'swish': (lambda x: x / (1 + exp(-x)), swish_derivative),
+    'tanh': (tanh, lambda x: 1 - tanh(x) ** 2),
+    'relu': (lambda x: maximum(0, x), lambda x: where(x > 0, 1.0, 0.0)),
+    'leaky_relu': (lambda x: maximum(x, x * 0.01), lambda x: where(x > 0, 1.0, 0.01)),
+    'softplus': (lambda x: log(1 + exp(x)), sigmoid)
+}
+'''Registro das funções de ativação: nome -> (função, derivada), ambas vetorizadas.'''
+
+
+def register_activation_function(name: str, function: Callable, derivative: Callable):
+    '''Função para registrar uma função de ativação personalizada.
+
+    As duas funções devem aceitar tanto números quanto arrays do NumPy. Camadas criadas depois do
+    registro podem usar o nome normalmente.
+
+    Parâmetros:
+    - `name:` Nome da função de ativação;
+    - `function:` Função de ativação;
+    - `derivative:` Derivada da função de ativação;
+
+    ```
+    >>> register_activation_function('gaussian', lambda x: exp(-x ** 2), lambda x: -2 * x * exp(-x ** 2))
+    ```
+    '''
+    if name == 'none':
+        raise ValueError('The activation function "none" cannot be replaced.')
+    ACTIVATION_FUNCTIONS[name] = (function, derivative)
+
+
+def get_activation_function(name: str) -> tuple[Callable, Callable]:
+    '''Função que retorna o par (função, derivada) registrado para o nome.
+
+    Parâmetros:
+    - `name:` Nome da função de ativação;
+    '''
+    if name not in ACTIVATION_FUNCTIONS:
+        raise ValueError(f'Invalid name "{name}". Try: {", ".join(ACTIVATION_FUNCTIONS)}')
+    return ACTIVATION_FUNCTIONS[name]
 
 
 class Neuron:
@@ -36,18 +107,10 @@ class Neuron:
         Parâmetros:
         - `name:` Nome da função de ativação;
         '''
-        functions = {
-            'none': lambda x: x - self.__bias,
-            'sigmoid': lambda x: 1 / (1 + exp(-x)),
-            'swish': lambda x: x / (1 + exp(-x)),
-            'tanh': tanh,
-            'relu': lambda x: max(0, x),
-            'leaky_relu': lambda x: x if x > 0 else x * 0.01,
-            'softplus': lambda x: log(1 + exp(x))
-        }
-        if name not in functions:
-            raise ValueError(f'Invalid name "{name}". Try: {", ".join(functions)}')
-        return functions[name]
+        function = get_activation_function(name)[0]
+        if name == 'none':
+            return lambda x: x - self.__bias
+        return function
 
     @property
     def value(self) -> float:
@@ -55,7 +118,7 @@ class Neuron:
 
     @value.setter
     def value(self, raw_value: float):
-        if not isinstance(raw_value, (int, float, int64, float64)):
+        if not isinstance(raw_value, (int, float, integer, floating)):
             raise TypeError('The value must be a number.')
         self.__value = raw_value
     
@@ -65,7 +128,7 @@ class Neuron:
 
     @bias.setter
     def bias(self, raw_bias: float):
-        if not isinstance(raw_bias, (int, float, int64, float64)):
+        if not isinstance(raw_bias, (int, float, integer, floating)):
             raise TypeError('The bias must be a number.')
         self.__bias = raw_bias
 
@@ -76,6 +139,8 @@ class Neuron:
 
 class NeuronRecurrent(Neuron):
     '''Neurônio recorrente matemático.
+
+    O estado oculto avança uma única vez a cada valor recebido, e ler `value` não o altera.
     
     Atributos:
     - `hidden_state:` Estado oculto do neurônio (privado);
@@ -83,7 +148,7 @@ class NeuronRecurrent(Neuron):
     '''
     __slots__ = ['__hidden_state', '__hidden_weights']
 
-    def __init__(self, activation_function: Literal['none', 'sigmoid', 'swish', 'tanh', 'relu', 'leaky_relu', 'softplus']):
+    def __init__(self, activation_function: Literal['none', 'sigmoid', 'swish', 'tanh', 'relu', 'leaky_relu', 'softplus'], rng: 'numpy.random.Generator | None' = None):
         '''Método construtor.
         
         Parâmetros:
@@ -95,18 +160,43 @@ class NeuronRecurrent(Neuron):
             - relu;
             - leaky relu;
             - softplus;
+        - `rng:` Gerador do NumPy para o peso oculto inicial; sem ele é usado o `random.gauss` global (opcional);
         '''
         super().__init__(activation_function)
         self.__hidden_state = 0
-        self.__hidden_weights = gauss(0, 1)
+        self.__hidden_weights = rng.standard_normal() if rng is not None else gauss(0, 1)
 
-    @Neuron.value.getter
+    @property
     def value(self) -> float:
-        '''Método que retorna o valor do neurônio após aplicar o estado oculto, pesos e função de ativação.'''
-        raw_value = self.get_raw() + self.__hidden_state * self.__hidden_weights + self.bias
-        self.__hidden_state = self.activation_function(raw_value)
+        '''Método que retorna o valor do neurônio no passo atual (o estado oculto), sem alterá-lo.'''
         return self.__hidden_state
 
+    @value.setter
+    def value(self, raw_value: float):
+        '''Método que recebe o valor do próximo passo e avança o estado oculto.
+
+        Parâmetros:
+        - `raw_value:` Valor recebido da camada anterior;
+        '''
+        Neuron.value.fset(self, raw_value)
+        self.__hidden_state = self.activation_function(self.get_raw() + self.__hidden_state * self.__hidden_weights + self.bias)
+
+    @property
+    def hidden_state(self) -> float:
+        '''Método que retorna o estado oculto.'''
+        return self.__hidden_state
+
+    @hidden_state.setter
+    def hidden_state(self, raw_hidden_state: float):
+        '''Método para definir o estado oculto (ex.: restaurar um estado salvo).
+
+        Parâmetros:
+        - `raw_hidden_state:` Valor do estado;
+        '''
+        if not isinstance(raw_hidden_state, (int, float, integer, floating)):
+            raise TypeError('The hidden state must be a number.')
+        self.__hidden_state = raw_hidden_state
+
     @property
     def hidden_weights(self) -> float:
         '''Método que retorna os pesos do estado oculto.'''
@@ -119,7 +209,7 @@ class NeuronRecurrent(Neuron):
         Parâmetros:
         - `raw_hidden_weights:` Valor dos pesos;
         '''
-        if not isinstance(raw_hidden_weights, (int, float, int64, float64)):
+        if not isinstance(raw_hidden_weights, (int, float, integer, floating)):
             raise TypeError('The hidden weights must be a number.')
         self.__hidden_weights = raw_hidden_weights
 
@@ -133,27 +223,63 @@ class Layer:
     
     Atributos:
     - `neurons:` Lista que guarda os neurônios (privado);
+    - `activation_function:` Nome da função de ativação (privado);
+    - `recurrent:` Se os neurônios são recorrentes (privado);
+    - `function:` Função de ativação vetorizada do registro (privado);
+    - `derivative:` Derivada vetorizada da função de ativação (privado);
     '''
-    __slots__ = ['__neurons']
+    __slots__ = ['__neurons', '__activation_function', '__recurrent', '__function', '__derivative']
 
-    def __init__(self, numbers_of_neurons: int, activation_function: Literal['none', 'sigmoid', 'swish', 'tanh', 'relu', 'leaky_relu', 'softplus'], recurrent: bool = False):
+    def __init__(self, numbers_of_neurons: int, activation_function: Literal['none', 'sigmoid', 'swish', 'tanh', 'relu', 'leaky_relu', 'softplus'], recurrent: bool = False, rng: 'numpy.random.Generator | None' = None):
         '''Método construtor.
         
         Parâmetros:
         - `numbers_of_neurons:` Quantidade de neurônios;
         - `activation_function:` Função de ativação;
         - `recurrent:` Se o neurônio é recorrente (opcional);
+        - `rng:` Gerador do NumPy para os pesos ocultos iniciais (opcional);
 
         ```
         >>> Layer(5, 'sigmoid')
         >>> Layer(5, 'sigmoid', True)
         ```
         '''
-        self.__neurons = [NeuronRecurrent(activation_function) if recurrent else Neuron(activation_function) for n in range(numbers_of_neurons)]
+        self.__function, self.__derivative = get_activation_function(activation_function)
+        self.__neurons = [NeuronRecurrent(activation_function, rng) if recurrent else Neuron(activation_function) for n in range(numbers_of_neurons)]
+        self.__activation_function = activation_function
+        self.__recurrent = recurrent
 
     def __len__(self) -> int:
         return len(self.__neurons)
 
+    def get_activation_function(self) -> str:
+        '''Método que retorna o nome da função de ativação da camada.'''
+        return self.__activation_function
+
+    def is_recurrent(self) -> bool:
+        '''Método que informa se a camada é recorrente.'''
+        return self.__recurrent
+
+    def activate(self, x: ndarray) -> ndarray:
+        '''Método que aplica a função de ativação da camada de forma vetorizada.
+
+        Parâmetros:
+        - `x:` Valores antes da função de ativação;
+        '''
+        return self.__function(x)
+
+    def derivative(self, x: ndarray) -> ndarray:
+        '''Método que aplica a derivada da função de ativação da camada de forma vetorizada.
+
+        Parâmetros:
+        - `x:` Valores antes da função de ativação;
+        '''
+        return self.__derivative(x)
+
+    def get_raws(self) -> list:
+        '''Método que retorna os valores dos neurônios sem viés e sem função de ativação.'''
+        return [neuron.get_raw() for neuron in self.__neurons]
+
     def get_biases(self) -> list:
         '''Método que retorna as bias dos neurônios.'''
         return [neuron.bias for neuron in self.__neurons]
@@ -195,6 +321,19 @@ class Layer:
         '''Método que retorna os pesos dos neurônios ocultos.'''
         return [neuron.hidden_weights for neuron in self.__neurons if isinstance(neuron, NeuronRecurrent)]
 
+    def get_hidden_states(self) -> list:
+        '''Método que retorna os estados ocultos dos neurônios recorrentes.'''
+        return [neuron.hidden_state for neuron in self.__neurons if isinstance(neuron, NeuronRecurrent)]
+
+    def set_hidden_states(self, states: list):
+        '''Método para definir os estados ocultos dos neurônios recorrentes.
+
+        Parâmetros:
+        - `states:` Lista de estados;
+        '''
+        for neuron, state in zip(self.__neurons, states):
+            neuron.hidden_state = state
+
     def set_hidden_weights(self, weights: list):
         '''Método para definir os pesos dos neurônios ocultos.
         
@@ -215,10 +354,12 @@ class Network:
     - `outputs:` Lista com a estrutura da camada de saída (privado);
     - `layers:` Lista de camadas (privado);
     - `weights:` Pesos da rede neural (privado);
+    - `compiled:` Versão compilada usada por `forward_batch`, refeita quando os parâmetros mudam (privado);
+    - `rng:` Gerador dos pesos iniciais e do embaralhamento do `fit` (privado);
     '''
-    __slots__ = ['__inputs', '__hiddens', '__outputs', '__layers', '__weights']
+    __slots__ = ['__inputs', '__hiddens', '__outputs', '__layers', '__weights', '__compiled', '__rng']
 
-    def __init__(self, structure: list[dict], weights: list | None = None, weights_initialization: Literal['random', 'xavier', 'he', 'lecun'] = 'random', biases: list | None = None, hidden_weights: list | None = None):
+    def __init__(self, structure: list[dict], weights: list | None = None, weights_initialization: Literal['random', 'xavier', 'he', 'lecun'] = 'random', biases: list | None = None, hidden_weights: list | None = None, seed: int | None = None):
         '''Método construtor.
         
         Parâmetros:
@@ -235,11 +376,16 @@ class Network:
             - `lecun`;
         - `biases:` Lista de bias da rede neural (opcional);
         - `hidden_weights:` Lista de pesos dos neurônios ocultos (opcional);
+        - `seed:` Semente dos pesos iniciais, pesos ocultos e embaralhamento; sem ela é usado o `numpy.random` global (opcional);
         '''
+        # `numpy.random` só é importado aqui: quem apenas carrega uma `CompiledNetwork` não paga por ele.
+        from numpy import random
         self.__inputs, *self.__hiddens, self.__outputs = structure
+        self.__compiled = None
+        self.__rng = random.default_rng(seed) if seed is not None else random
         self.__layers = []
         for idx in range(1, len(structure)):
-            self.__layers.append(Layer(**structure[idx]))
+            self.__layers.append(Layer(**structure[idx], rng=self.__rng if seed is not None else None))
         self.set_weights(weights, weights_initialization)
         self.set_biases(biases)
         self.set_hidden_weights(hidden_weights)
@@ -255,7 +401,8 @@ class Network:
             - `he`;
             - `lecun`;
         '''
-        self.__weights = weights
+        self.__weights = [array(layer_weights, dtype=float64) for layer_weights in weights] if weights else weights
+        self.__compiled = None
         if not weights:
             self.__weights = []
             if weights_initialization == 'random':
@@ -271,29 +418,29 @@ class Network:
     
     def inicialization_random(self):
         '''Método para inicialização de pesos com o método random.'''
-        self.__weights.append(random.uniform(-0.01, 0.01, size=(self.__inputs['numbers_of_neurons'], len(self.__layers[0]))))
+        self.__weights.append(self.__rng.uniform(-0.01, 0.01, size=(self.__inputs['numbers_of_neurons'], len(self.__layers[0]))))
         for idx in range(1, len(self.__layers)):
-            self.__weights.append(random.uniform(-0.01, 0.01, size=(len(self.__layers[idx - 1]), len(self.__layers[idx]))))
+            self.__weights.append(self.__rng.uniform(-0.01, 0.01, size=(len(self.__layers[idx - 1]), len(self.__layers[idx]))))
     
     def inicialization_xavier(self):
         '''Método para inicialização de pesos com o método xavier.'''
         limit = sqrt(6 / (self.__inputs['numbers_of_neurons'] + len(self.__layers[0])))
-        self.__weights.append(random.uniform(-limit, limit, size=(self.__inputs['numbers_of_neurons'], len(self.__layers[0]))))
+        self.__weights.append(self.__rng.uniform(-limit, limit, size=(self.__inputs['numbers_of_neurons'], len(self.__layers[0]))))
         for idx in range(1, len(self.__layers)):
             limit = sqrt(6 / (len(self.__layers[idx - 1]) + len(self.__layers[idx])))
-            self.__weights.append(random.uniform(-limit, limit, size=(len(self.__layers[idx - 1]), len(self.__layers[idx]))))
+            self.__weights.append(self.__rng.uniform(-limit, limit, size=(len(self.__layers[idx - 1]), len(self.__layers[idx]))))
     
     def inicialization_he(self):
         '''Método para inicialização de pesos com o método he.'''
-        self.__weights.append(random.randn(self.__inputs['numbers_of_neurons'], len(self.__layers[0])) * sqrt(2 / self.__inputs['numbers_of_neurons']))
+        self.__weights.append(self.__rng.standard_normal((self.__inputs['numbers_of_neurons'], len(self.__layers[0]))) * sqrt(2 / self.__inputs['numbers_of_neurons']))
         for idx in range(1, len(self.__layers)):
-            self.__weights.append(random.randn(len(self.__layers[idx - 1]), len(self.__layers[idx])) * sqrt(2 / len(self.__layers[idx - 1])))
+            self.__weights.append(self.__rng.standard_normal((len(self.__layers[idx - 1]), len(self.__layers[idx]))) * sqrt(2 / len(self.__layers[idx - 1])))
 
     def inicialization_lecun(self):
         '''Método para inicialização de pesos com método lecun.'''
-        self.__weights.append(random.randn(self.__inputs['numbers_of_neurons'], len(self.__layers[0])) * sqrt(1 / self.__inputs['numbers_of_neurons']))
+        self.__weights.append(self.__rng.standard_normal((self.__inputs['numbers_of_neurons'], len(self.__layers[0]))) * sqrt(1 / self.__inputs['numbers_of_neurons']))
         for idx in range(1, len(self.__layers)):
-            self.__weights.append(random.randn(len(self.__layers[idx - 1]), len(self.__layers[idx])) * sqrt(1 / len(self.__layers[idx - 1])))
+            self.__weights.append(self.__rng.standard_normal((len(self.__layers[idx - 1]), len(self.__layers[idx]))) * sqrt(1 / len(self.__layers[idx - 1])))
 
     def set_biases(self, biases: list):
         '''Método para a definição dos bias da rede neural.
@@ -301,6 +448,7 @@ class Network:
         Parâmetros:
         - `biases:` Lista de bias da rede neural;
         '''
+        self.__compiled = None
         if biases:
             for idx, biases in enumerate(biases):
                 self.__layers[idx].set_biases(biases)
@@ -323,6 +471,7 @@ class Network:
         Parâmetros:
         - `hidden_weights:` Lista de pesos dos neurônios ocultos;
         '''
+        self.__compiled = None
         if hidden_weights:
             for idx, weights in enumerate(hidden_weights):
                 self.__layers[idx].set_hidden_weights(weights)
@@ -331,63 +480,328 @@ class Network:
         '''Método que retorna as camadas da rede neural.'''
         return self.__layers
 
+    def get_inputs(self) -> int:
+        '''Método que retorna a quantidade de entradas da rede.'''
+        return self.__inputs['numbers_of_neurons']
+
+    def get_structure(self) -> list[dict]:
+        '''Método que retorna a estrutura da rede neural, no mesmo formato recebido pelo construtor.'''
+        return [self.__inputs, *self.__hiddens, self.__outputs]
+
+    def to_dict(self) -> dict:
+        '''Método que retorna a rede no formato do `network.json` (aceito por `Network(**dados)`).'''
+        return {
+            'structure': self.get_structure(),
+            'weights': [weights.tolist() for weights in self.__weights],
+            'biases': [[float(bias) for bias in biases] for biases in self.get_biases()],
+            'hidden_weights': [[float(weight) for weight in weights] for weights in self.get_hidden_weights()]
+        }
+
+    def save(self, path: str, dtype: Literal['float32', 'float64'] = 'float64'):
+        '''Método que salva a rede no formato binário, que pode ser aberto por memória mapeada.
+
+        O arquivo tem uma assinatura, um cabeçalho JSON com a estrutura e a posição de cada array,
+        e os pesos, bias e pesos ocultos crus, alinhados em 64 bytes.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        - `dtype:` Tipo dos números guardados (opcional);
+        '''
+        arrays = []
+        for idx, layer in enumerate(self.__layers):
+            arrays.append((idx, 'weights', self.__weights[idx]))
+            arrays.append((idx, 'biases', array(layer.get_biases(), dtype=float64)))
+            if layer.is_recurrent():
+                arrays.append((idx, 'hidden_weights', array(layer.get_hidden_weights(), dtype=float64)))
+        write_binary(path, self.get_structure(), arrays, dtype)
+
+    @classmethod
+    def load(cls, path: str) -> 'Network':
+        '''Método que cria uma rede a partir de um arquivo binário salvo por `save`.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        '''
+        structure, arrays = read_binary(path)
+        layers = range(len(structure) - 1)
+        return cls(
+            structure,
+            weights=[arrays[idx, 'weights'] for idx in layers],
+            biases=[array(arrays[idx, 'biases'], dtype=float64) for idx in layers],
+            hidden_weights=[array(arrays.get((idx, 'hidden_weights'), []), dtype=float64) for idx in layers]
+        )
+
+    def get_parameters(self) -> ndarray:
+        '''Método que retorna todos os parâmetros em um vetor: pesos, bias e pesos ocultos de cada camada, em ordem.'''
+        parameters = []
+        for layer, weights in zip(self.__layers, self.__weights):
+            parameters += [weights.ravel(), array(layer.get_biases(), dtype=float64), array(layer.get_hidden_weights(), dtype=float64)]
+        return concatenate(parameters)
+
+    def set_parameters(self, parameters: ndarray):
+        '''Método para definir todos os parâmetros a partir de um vetor no formato de `get_parameters`.
+
+        Parâmetros:
+        - `parameters:` Vetor de parâmetros;
+        '''
+        parameters = array(parameters, dtype=float64)
+        if len(parameters) != len(self.get_parameters()):
+            raise ValueError(f'Expected {len(self.get_parameters())} parameters, got {len(parameters)}.')
+        self.__compiled = None
+        start = 0
+        for layer, weights in zip(self.__layers, self.__weights):
+            weights[...] = parameters[start:start + weights.size].reshape(weights.shape)
+            start += weights.size
+            layer.set_biases(parameters[start:start + len(layer)])
+            start += len(layer)
+            if layer.is_recurrent():
+                layer.set_hidden_weights(parameters[start:start + len(layer)])
+                start += len(layer)
+
+    def compile(self, dtype: Literal['float64', 'float32', 'int8'] = 'float64') -> 'CompiledNetwork':
+        '''Método que congela a rede em uma `CompiledNetwork` para inferência rápida.
+
+        Os pesos, bias e pesos ocultos são copiados, então alterações feitas depois na rede
+        (ex.: treinamento) não afetam a versão compilada.
+
+        Parâmetros:
+        - `dtype:` Tipo dos pesos guardados; veja `CompiledNetwork.quantize` (opcional);
+        '''
+        weights, biases, hidden_weights, activation_functions = [], [], [], []
+        for layer, layer_weights in zip(self.__layers, self.__weights):
+            name = layer.get_activation_function()
+            weights.append(array(layer_weights, dtype=float64))
+            # Com 'none' o neurônio subtrai o próprio bias, então ele não tem efeito na saída.
+            biases.append(zeros(len(layer)) if name == 'none' else array(layer.get_biases(), dtype=float64))
+            hidden_weights.append(array(layer.get_hidden_weights(), dtype=float64) if layer.is_recurrent() else None)
+            activation_functions.append(name)
+        compiled = CompiledNetwork(weights, biases, activation_functions, hidden_weights)
+        return compiled if dtype == 'float64' else compiled.quantize(dtype)
+
     def backpropagation(self, inputs: list, targets: list, learning_rate: float):
         '''
         Método para realizar a retropropagação (backpropagation) da rede neural.
 
+        As derivadas são tomadas no valor completo antes da ativação (pesos, bias e, nas camadas
+        recorrentes, estado oculto vezes peso oculto), calculado por `__unroll` como uma janela de
+        um passo. Nas camadas recorrentes os pesos ocultos também são ajustados, com o estado
+        oculto de antes do passo tratado como constante (retropropagação truncada em um passo;
+        para sequências use `fit_sequence`). O estado oculto avança como em `forward`.
+
         Parâmetros:
         - `inputs:` Lista de entradas da rede neural;
         - `targets:` Lista de saídas esperadas;
         - `learning_rate:` Taxa de aprendizado;
         '''
-        outputs = self.forward(inputs)
+        self.__compiled = None
+        names = [layer.get_activation_function() for layer in self.__layers]
+        biases = [array(layer.get_biases(), dtype=float64) for layer in self.__layers]
+        hidden_weights = [array(layer.get_hidden_weights(), dtype=float64) if layer.is_recurrent() else None for layer in self.__layers]
+        values, raw_values, previous = self.__unroll(array([inputs], dtype=float64), self.get_hidden_states(), biases, hidden_weights)
+        self.forward(inputs)
+
+        errors = array([targets], dtype=float64) - values[-1]
+        for idx in range(len(self.__layers) - 1, -1, -1):
+            gradients = errors * self.__layers[idx].derivative(raw_values[idx])
+            if idx:
+                errors = dot(gradients, self.__weights[idx].T)
+            self.__weights[idx] += learning_rate * dot(values[idx].T, gradients)
+            if names[idx] != 'none':
+                biases[idx] += learning_rate * gradients[0]
+            if hidden_weights[idx] is not None:
+                hidden_weights[idx] += learning_rate * gradients[0] * previous[idx][0]
+        self.set_biases(biases)
+        for layer, weights in zip(self.__layers, hidden_weights):
+            if weights is not None:
+                layer.set_hidden_weights(weights)
+
+    def fit(self, X: ndarray, Y: ndarray, epochs: int = 1, batch_size: int = 32, learning_rate: float = 0.01, shuffle: bool = True) -> list[float]:
+        '''Método que treina a rede em mini-lotes, calculando os gradientes de cada lote com operações de matrizes.
+
+        Os bias são lidos dos neurônios uma vez, atualizados como vetores durante todo o treino e
+        escritos de volta no final. Retorna a perda (erro quadrático médio) de cada época.
+
+        Parâmetros:
+        - `X:` Matriz (N, entradas) de entradas;
+        - `Y:` Matriz (N, saídas) de saídas esperadas;
+        - `epochs:` Quantidade de épocas (opcional);
+        - `batch_size:` Tamanho de cada mini-lote (opcional);
+        - `learning_rate:` Taxa de aprendizado (opcional);
+        - `shuffle:` Se as amostras são embaralhadas a cada época (opcional);
+
+        ```
+        >>> rede.fit(X, Y, epochs=10, batch_size=64, learning_rate=0.1)
+        ```
+        '''
+        if any(layer.is_recurrent() for layer in self.__layers):
+            raise ValueError('fit only trains feed forward networks.')
+        X, Y = array(X, dtype=float64), array(Y, dtype=float64)
+        if X.ndim != 2 or Y.ndim != 2 or len(X) != len(Y):
+            raise ValueError(f'X and Y must be 2D arrays with the same number of rows, got shapes {X.shape} and {Y.shape}.')
+        self.__compiled = None
+        biases = [array(layer.get_biases(), dtype=float64) for layer in self.__layers]
+        losses = []
+        for epoch in range(epochs):
+            order = self.__rng.permutation(len(X)) if shuffle else arange(len(X))
+            total = 0
+            for start in range(0, len(X), batch_size):
+                batch = order[start:start + batch_size]
+                total += self.__train_step(X[batch], Y[batch], biases, learning_rate) * len(batch)
+            losses.append(total / len(X))
+        self.set_biases(biases)
+        return losses
+
+    def fit_batches(self, batches, learning_rate: float = 0.01) -> float:
+        '''Método que treina a rede com mini-lotes vindos de um iterável (ex.: um gerador que lê do disco).
+
+        Como no `fit`, os bias são atualizados como vetores e escritos nos neurônios só no final.
+        Retorna a perda média por amostra.
+
+        Parâmetros:
+        - `batches:` Iterável de pares `(entradas, saídas esperadas)`;
+        - `learning_rate:` Taxa de aprendizado (opcional);
+        '''
+        if any(layer.is_recurrent() for layer in self.__layers):
+            raise ValueError('fit_batches only trains feed forward networks.')
+        self.__compiled = None
+        biases = [array(layer.get_biases(), dtype=float64) for layer in self.__layers]
+        total, samples = 0, 0
+        for inputs, targets in batches:
+            inputs, targets = array(inputs, dtype=float64), array(targets, dtype=float64)
+            total += self.__train_step(inputs, targets, biases, learning_rate) * len(inputs)
+            samples += len(inputs)
+        self.set_biases(biases)
+        return total / samples if samples else 0.0
+
+    def fit_sequence(self, X: ndarray, Y: ndarray, window: int = 32, epochs: int = 1, learning_rate: float = 0.01) -> list[float]:
+        '''Método que treina a rede em uma sequência com retropropagação no tempo truncada (truncated BPTT).
 
-        output_errors = array(targets) - array(outputs)
+        A sequência é percorrida em janelas consecutivas de `window` passos. O estado oculto passa
+        de uma janela para a próxima, mas o gradiente de cada janela só volta até o início dela.
+        Pesos, bias e pesos ocultos são ajustados ao fim de cada janela. Cada época começa com o
+        estado oculto zerado, e os estados são zerados no final. Retorna a perda (erro
+        quadrático médio) de cada época.
+
+        Parâmetros:
+        - `X:` Matriz (T, entradas) com a entrada de cada passo;
+        - `Y:` Matriz (T, saídas) com a saída esperada de cada passo;
+        - `window:` Passos por janela (opcional);
+        - `epochs:` Quantidade de épocas (opcional);
+        - `learning_rate:` Taxa de aprendizado (opcional);
+
+        ```
+        >>> rede.fit_sequence(entradas, saidas, window=64, epochs=20, learning_rate=0.05)
+        ```
+        '''
+        X, Y = array(X, dtype=float64), array(Y, dtype=float64)
+        if X.ndim != 2 or Y.ndim != 2 or len(X) != len(Y):
+            raise ValueError(f'X and Y must be 2D arrays (T, features) with the same number of steps, got shapes {X.shape} and {Y.shape}.')
+        self.__compiled = None
+        names = [layer.get_activation_function() for layer in self.__layers]
+        biases = [array(layer.get_biases(), dtype=float64) for layer in self.__layers]
+        hidden_weights = [array(layer.get_hidden_weights(), dtype=float64) if layer.is_recurrent() else None for layer in self.__layers]
+        losses = []
+        for epoch in range(epochs):
+            states = [None if weights is None else zeros(len(weights)) for weights in hidden_weights]
+            total = 0
+            for start in range(0, len(X), window):
+                inputs, targets = X[start:start + window], Y[start:start + window]
+                values, raw_values, previous = self.__unroll(inputs, states, biases, hidden_weights)
+                states = [None if weights is None else values[idx + 1][-1] for idx, weights in enumerate(hidden_weights)]
 
-        output_gradients = output_errors * array([self.derivative(neuron.get_raw(), neuron.activation_function) for neuron in self.__layers[-1].get_neurons()])
+                errors = targets - values[-1]
+                total += float((errors ** 2).sum()) / Y.shape[1]
+                for idx in range(len(self.__layers) - 1, -1, -1):
+                    derivatives = self.__layers[idx].derivative(raw_values[idx])
+                    if hidden_weights[idx] is None:
+                        gradients = errors * derivatives
+                    else:
+                        gradients = zeros(errors.shape)
+                        carried = zeros(errors.shape[1])
+                        for step in range(len(errors) - 1, -1, -1):
+                            gradients[step] = (errors[step] + carried * hidden_weights[idx]) * derivatives[step]
+                            carried = gradients[step]
+                    if idx:
+                        errors = dot(gradients, self.__weights[idx].T)
+                    self.__weights[idx] += learning_rate * dot(values[idx].T, gradients) / len(inputs)
+                    if names[idx] != 'none':
+                        biases[idx] += learning_rate * gradients.mean(axis=0)
+                    if hidden_weights[idx] is not None:
+                        hidden_weights[idx] += learning_rate * (gradients * previous[idx]).mean(axis=0)
+            losses.append(total / len(X))
+        self.set_biases(biases)
+        for layer, weights in zip(self.__layers, hidden_weights):
+            if weights is not None:
+                layer.set_hidden_weights(weights)
+        self.reset_hidden_states()
+        return losses
 
-        hidden_values = array(self.__layers[-2].get_values()) if len(self.__layers) > 1 else array(inputs)
-        self.__weights[-1] += learning_rate * dot(hidden_values.reshape(-1, 1), output_gradients.reshape(1, -1))
+    def __unroll(self, inputs: ndarray, states: list, biases: list, hidden_weights: list) -> tuple:
+        '''Método que propaga uma sequência camada por camada e retorna `(valores, valores brutos, estados anteriores)` de cada passo.
 
-        for i, neuron in enumerate(self.__layers[-1].get_neurons()):
-            neuron.bias += learning_rate * output_gradients[i]
+        As camadas comuns processam todos os passos com uma multiplicação de matrizes; nas
+        recorrentes só a soma do estado oculto é feita passo a passo.
 
-        hidden_errors = output_gradients
-        for i in range(len(self.__layers) - 2, -1, -1):
-            hidden_errors = dot(hidden_errors, self.__weights[i + 1].T)
+        Parâmetros:
+        - `inputs:` Matriz (T, entradas);
+        - `states:` Estado oculto inicial de cada camada, `None` nas não recorrentes;
+        - `biases:` Lista de vetores de bias;
+        - `hidden_weights:` Lista de vetores de pesos ocultos, `None` nas camadas não recorrentes;
+        '''
+        values, raw_values, previous = [inputs], [], []
+        for layer, weights, layer_biases, layer_hidden_weights, state in zip(self.__layers, self.__weights, biases, hidden_weights, states):
+            raw = dot(values[-1], weights) + (layer_biases if layer.get_activation_function() != 'none' else 0)
+            if layer_hidden_weights is None:
+                raw_values.append(raw)
+                values.append(layer.activate(raw))
+                previous.append(None)
+                continue
+            outputs, before = zeros(raw.shape), zeros(raw.shape)
+            for step in range(len(raw)):
+                before[step] = state
+                raw[step] += state * layer_hidden_weights
+                state = outputs[step] = layer.activate(raw[step])
+            raw_values.append(raw)
+            values.append(outputs)
+            previous.append(before)
+        return values, raw_values, previous
 
-            hidden_gradients = hidden_errors * array([self.derivative(neuron.get_raw(), neuron.activation_function) for neuron in self.__layers[i].get_neurons()])
+    def __train_step(self, inputs: ndarray, targets: ndarray, biases: list, learning_rate: float) -> float:
+        '''Método que aplica um passo de gradiente para um mini-lote e retorna a perda do lote.
 
-            previous_values = array(inputs) if i == 0 else array(self.__layers[i - 1].get_values())
-            self.__weights[i] += learning_rate * dot(previous_values.reshape(-1, 1), hidden_gradients.reshape(1, -1))
+        Parâmetros:
+        - `inputs:` Matriz (n, entradas) do lote;
+        - `targets:` Matriz (n, saídas) do lote;
+        - `biases:` Lista de vetores de bias, atualizados no próprio lugar;
+        - `learning_rate:` Taxa de aprendizado;
+        '''
+        names = [layer.get_activation_function() for layer in self.__layers]
+        values, raw_values = [inputs], []
+        for layer, weights, layer_biases, name in zip(self.__layers, self.__weights, biases, names):
+            raw = dot(values[-1], weights) + (layer_biases if name != 'none' else 0)
+            raw_values.append(raw)
+            values.append(layer.activate(raw))
 
-            for j, neuron in enumerate(self.__layers[i].get_neurons()):
-                neuron.bias += learning_rate * hidden_gradients[j]
+        errors = targets - values[-1]
+        loss = float((errors ** 2).mean())
+        for idx in range(len(self.__layers) - 1, -1, -1):
+            gradients = errors * self.__layers[idx].derivative(raw_values[idx])
+            if idx:
+                errors = dot(gradients, self.__weights[idx].T)
+            self.__weights[idx] += learning_rate * dot(values[idx].T, gradients) / len(inputs)
+            if names[idx] != 'none':
+                biases[idx] += learning_rate * gradients.mean(axis=0)
+        return loss
 
-    def derivative(self, x: float, activation_function: Callable[[float], float]) -> float:
+    def derivative(self, x: float, activation_function: str) -> float:
         '''
         Calcula a derivada da função de ativação.
 
         Parâmetros:
         - `x:` Valor de entrada;
-        - `activation_function:` Função de ativação;
+        - `activation_function:` Nome da função de ativação;
         '''
-        if activation_function.__name__ == '<lambda>':
-            if activation_function(0) == 0.5:
-                return activation_function(x) * (1 - activation_function(x))
-            elif activation_function(0) == 0:
-                return 1 if x > 0 else 0
-            elif activation_function(1) == 1:
-                return 1
-            else:
-                sigmoid_x = 1 / (1 + exp(-x))
-                return sigmoid_x + x * sigmoid_x * (1 - sigmoid_x)
-        elif activation_function.__name__ == 'tanh':
-            return 1 - tanh(x) ** 2
-        elif activation_function.__name__ == 'softplus':
-            return 1 / (1 + exp(-x))
-        else:
-            return 1 if x > 0 else 0.01
+        return get_activation_function(activation_function)[1](x)
 
     def forward(self, parameters: list) -> list:
         '''Método que realiza a feedforward da rede neural.
@@ -399,3 +813,321 @@ class Network:
         for idx in range(1, len(self.__layers)):
             self.__layers[idx].set_values(self.__layers[idx - 1].get_values(), self.__weights[idx])
         return self.__layers[-1].get_values()
+
+    def forward_batch(self, inputs: ndarray) -> ndarray:
+        '''Método que realiza a feedforward de várias entradas de uma vez, com uma multiplicação de matrizes por camada.
+
+        Usa a versão compilada da rede, refeita sempre que os pesos ou bias são alterados pelos métodos da rede.
+        Nas camadas recorrentes cada linha tem o próprio estado oculto, guardado na versão compilada
+        (independente do estado dos objetos `NeuronRecurrent`).
+
+        Parâmetros:
+        - `inputs:` Matriz (N, entradas) com uma entrada por linha;
+        '''
+        if self.__compiled is None:
+            self.__compiled = self.compile()
+        return self.__compiled.forward_batch(inputs)
+
+    def forward_sequence(self, sequence: ndarray) -> ndarray:
+        '''Método que processa uma sequência inteira de uma vez e retorna a saída de cada passo.
+
+        Equivale a chamar `forward` para cada passo: começa do estado oculto atual dos neurônios e
+        deixa neles o estado do último passo.
+
+        Parâmetros:
+        - `sequence:` Matriz (T, entradas) com a entrada de cada passo;
+        '''
+        sequence = array(sequence, dtype=float64)
+        if sequence.ndim != 2:
+            raise ValueError(f'The sequence must be a 2D array (T, inputs), got shape {sequence.shape}.')
+        biases = [array(layer.get_biases(), dtype=float64) for layer in self.__layers]
+        hidden_weights = [array(layer.get_hidden_weights(), dtype=float64) if layer.is_recurrent() else None for layer in self.__layers]
+        values = self.__unroll(sequence, self.get_hidden_states(), biases, hidden_weights)[0]
+        self.set_hidden_states([None if weights is None else values[idx + 1][-1] for idx, weights in enumerate(hidden_weights)])
+        return values[-1]
+
+    def get_hidden_states(self) -> list:
+        '''Método que retorna uma cópia do estado oculto de cada camada (`None` nas não recorrentes), para ser restaurada com `set_hidden_states`.'''
+        return [array(layer.get_hidden_states(), dtype=float64) if layer.is_recurrent() else None for layer in self.__layers]
+
+    def set_hidden_states(self, states: list):
+        '''Método para restaurar os estados ocultos dos neurônios.
+
+        Parâmetros:
+        - `states:` Lista com o estado de cada camada, `None` nas não recorrentes (formato de `get_hidden_states`);
+        '''
+        for layer, state in zip(self.__layers, states):
+            if state is not None:
+                layer.set_hidden_states(list(state))
+
+    def reset_hidden_states(self):
+        '''Método para reiniciar os estados ocultos da rede, inclusive os usados por `forward_batch`.'''
+        for layer in self.__layers:
+            layer.reset_hidden_states()
+        if self.__compiled is not None:
+            self.__compiled.reset_hidden_states()
+
+
+class CompiledNetwork:
+    '''Rede neural congelada para inferência, com cada camada guardada em matrizes contíguas.
+
+    Em vez de passar cada valor por objetos `Neuron`, cada camada é uma matriz de pesos e um
+    vetor de bias, e as funções de ativação são aplicadas de forma vetorizada. Com pesos em
+    float32 ou int8 (veja `quantize`), as contas são feitas em float32.
+
+    Atributos:
+    - `weights:` Lista de matrizes de pesos (privado);
+    - `biases:` Lista de vetores de bias (privado);
+    - `activation_functions:` Lista com o nome da função de ativação de cada camada (privado);
+    - `functions:` Lista de funções de ativação vetorizadas (privado);
+    - `hidden_weights:` Lista de vetores de pesos ocultos, `None` nas camadas não recorrentes (privado);
+    - `hidden_states:` Lista de estados ocultos, `None` nas camadas não recorrentes (privado);
+    - `scales:` Escala de cada camada com pesos int8, `None` nas demais (privado);
+    - `dtype:` Tipo usado nas contas, float64 ou float32 (privado);
+    '''
+    __slots__ = ['__weights', '__biases', '__activation_functions', '__functions', '__hidden_weights', '__hidden_states', '__scales', '__dtype']
+
+    def __init__(self, weights: list, biases: list, activation_functions: list[str], hidden_weights: list | None = None, scales: list | None = None):
+        '''Método construtor.
+
+        Parâmetros:
+        - `weights:` Lista de matrizes de pesos de cada camada;
+        - `biases:` Lista de vetores de bias de cada camada;
+        - `activation_functions:` Lista com o nome da função de ativação de cada camada;
+        - `hidden_weights:` Lista de vetores de pesos ocultos, `None` nas camadas não recorrentes (opcional);
+        - `scales:` Escala de cada camada com pesos int8, `None` nas demais (opcional);
+
+        ```
+        >>> Network(**json.load(file)).compile()
+        ```
+        '''
+        self.__weights = weights
+        self.__biases = biases
+        self.__activation_functions = list(activation_functions)
+        self.__functions = [get_activation_function(name)[0] for name in activation_functions]
+        self.__hidden_weights = hidden_weights or [None] * len(weights)
+        self.__scales = scales or [None] * len(weights)
+        self.__dtype = float64 if weights[0].dtype == float64 else float32
+        self.__hidden_states = []
+        self.reset_hidden_states()
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledNetwork':
+        '''Método que abre um arquivo binário salvo por `Network.save` sem copiar os pesos.
+
+        Os arrays são visões de um único `numpy.memmap` somente leitura, então abrir muitos modelos
+        custa quase nada e processos que abrem o mesmo arquivo compartilham as páginas.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        '''
+        structure, arrays = read_binary(path)
+        layers = structure[1:]
+        return cls(
+            [arrays[idx, 'weights'] for idx in range(len(layers))],
+            [zeros(layer['numbers_of_neurons']) if layer['activation_function'] == 'none' else arrays[idx, 'biases'] for idx, layer in enumerate(layers)],
+            [layer['activation_function'] for layer in layers],
+            [arrays.get((idx, 'hidden_weights')) for idx in range(len(layers))]
+        )
+
+    def get_inputs(self) -> int:
+        '''Método que retorna a quantidade de entradas da rede.'''
+        return len(self.__weights[0])
+
+    def get_dtype(self) -> str:
+        '''Método que retorna o tipo dos pesos guardados: `float64`, `float32` ou `int8`.'''
+        return str(self.__weights[0].dtype)
+
+    def get_nbytes(self) -> int:
+        '''Método que retorna a memória ocupada pelos pesos, bias e pesos ocultos, em bytes.'''
+        arrays = self.__weights + self.__biases + [weights for weights in self.__hidden_weights if weights is not None]
+        return sum(values.nbytes for values in arrays)
+
+    def quantize(self, dtype: Literal['float32', 'int8']) -> 'CompiledNetwork':
+        '''Método que retorna uma cópia da rede com os pesos em um tipo menor.
+
+        Em float32 todos os arrays são convertidos. Em int8 cada matriz de pesos é guardada como
+        inteiros de -127 a 127 e uma escala por camada (`max(|pesos|) / 127`), e bias e pesos
+        ocultos ficam em float32. As duas versões fazem as contas em float32; use
+        `max_deviation` para medir a diferença em relação à rede original.
+
+        Parâmetros:
+        - `dtype:` `float32` ou `int8`;
+
+        ```
+        >>> rede = Network(**json.load(file)).compile('int8')
+        ```
+        '''
+        if dtype not in ('float32', 'int8'):
+            raise ValueError(f'Invalid dtype "{dtype}". Choose from float32, int8')
+        weights, scales = [], []
+        for layer_weights, scale in zip(self.__weights, self.__scales):
+            layer_weights = layer_weights * scale if scale is not None else layer_weights
+            if dtype == 'float32':
+                weights.append(array(layer_weights, dtype=float32))
+                scales.append(None)
+                continue
+            scale = float(abs(layer_weights).max()) / 127 or 1.0
+            weights.append((layer_weights / scale).round().astype(int8))
+            scales.append(float32(scale))
+        return CompiledNetwork(
+            weights,
+            [array(biases, dtype=float32) for biases in self.__biases],
+            self.__activation_functions,
+            [None if hidden_weights is None else array(hidden_weights, dtype=float32) for hidden_weights in self.__hidden_weights],
+            scales
+        )
+
+    def max_deviation(self, reference: 'CompiledNetwork', inputs: ndarray) -> float:
+        '''Método que compara as saídas com as de uma rede de referência (ex.: a versão float64) e retorna o maior desvio absoluto.
+
+        Os estados ocultos das duas redes são reiniciados antes e depois da comparação.
+
+        Parâmetros:
+        - `reference:` Rede de referência;
+        - `inputs:` Matriz (N, entradas) de entradas usadas na comparação;
+
+        ```
+        >>> rede.compile('int8').max_deviation(rede.compile(), entradas)
+        ```
+        '''
+        self.reset_hidden_states()
+        reference.reset_hidden_states()
+        deviation = float(abs(array(self.forward_batch(inputs), dtype=float64) - reference.forward_batch(inputs)).max())
+        self.reset_hidden_states()
+        reference.reset_hidden_states()
+        return deviation
+
+    def reset_hidden_states(self):
+        '''Método para reiniciar os estados ocultos das camadas recorrentes.'''
+        self.__hidden_states = [None if weights is None else zeros(len(weights), dtype=self.__dtype) for weights in self.__hidden_weights]
+
+    def get_hidden_states(self) -> list:
+        '''Método que retorna uma cópia do estado oculto de cada camada (`None` nas não recorrentes), para ser restaurada com `set_hidden_states`.'''
+        return [None if state is None else state.copy() for state in self.__hidden_states]
+
+    def set_hidden_states(self, states: list):
+        '''Método para restaurar os estados ocultos, de uma partida (1D) ou de um lote (2D, uma linha por entrada).
+
+        Parâmetros:
+        - `states:` Lista com o estado de cada camada, `None` nas não recorrentes (formato de `get_hidden_states`);
+        '''
+        self.__hidden_states = [None if state is None else array(state, dtype=self.__dtype) for state in states]
+
+    def forward_sequence(self, sequence: ndarray) -> ndarray:
+        '''Método que processa uma sequência passo a passo e retorna a saída de cada passo, como várias chamadas de `forward`.
+
+        Parâmetros:
+        - `sequence:` Matriz (T, entradas) com a entrada de cada passo;
+        '''
+        sequence = array(sequence, dtype=self.__dtype)
+        if sequence.ndim != 2:
+            raise ValueError(f'The sequence must be a 2D array (T, inputs), got shape {sequence.shape}.')
+        return array([self.__propagate(values) for values in sequence])
+
+    def forward(self, parameters: list) -> ndarray:
+        '''Método que realiza a feedforward da rede neural.
+
+        Parâmetros:
+        - `parameters:` Parâmetros de entrada da rede neural;
+        '''
+        return self.__propagate(array(parameters, dtype=self.__dtype))
+
+    def forward_batch(self, inputs: ndarray) -> ndarray:
+        '''Método que realiza a feedforward de várias entradas de uma vez, com uma multiplicação de matrizes por camada.
+
+        Nas camadas recorrentes cada linha carrega o próprio estado oculto entre as chamadas, então
+        o número de linhas deve se manter até `reset_hidden_states` ser chamado.
+
+        Parâmetros:
+        - `inputs:` Matriz (N, entradas) com uma entrada por linha;
+        '''
+        inputs = array(inputs, dtype=self.__dtype)
+        if inputs.ndim != 2:
+            raise ValueError(f'The inputs must be a 2D array (N, inputs), got shape {inputs.shape}.')
+        return self.__propagate(inputs)
+
+    def __propagate(self, values: ndarray) -> ndarray:
+        '''Método que propaga uma entrada (1D) ou um lote de entradas (2D) pelas camadas.
+
+        Parâmetros:
+        - `values:` Entrada ou lote de entradas;
+        '''
+        for hidden_state in self.__hidden_states:
+            if hidden_state is not None and hidden_state.ndim == 2 and (values.ndim == 1 or len(hidden_state) != len(values)):
+                raise ValueError(f'The hidden states hold {len(hidden_state)} rows. Call reset_hidden_states() before changing the batch size.')
+        for idx, weights in enumerate(self.__weights):
+            raw_values = dot(values, weights)
+            if self.__scales[idx] is not None:
+                raw_values = raw_values * self.__scales[idx]
+            if self.__hidden_weights[idx] is not None:
+                raw_values = raw_values + self.__hidden_states[idx] * self.__hidden_weights[idx] + self.__biases[idx]
+                values = self.__hidden_states[idx] = self.__functions[idx](raw_values)
+            else:
+                values = self.__functions[idx](raw_values + self.__biases[idx])
+        return values
+
+
+def write_binary(path: str, structure: list[dict], arrays: list[tuple], dtype: str = 'float64'):
+    '''Função que escreve uma rede no formato binário.
+
+    Parâmetros:
+    - `path:` Caminho do arquivo;
+    - `structure:` Estrutura da rede;
+    - `arrays:` Lista de `(camada, tipo, array)`, com tipo `weights`, `biases` ou `hidden_weights`;
+    - `dtype:` Tipo dos números guardados (opcional);
+    '''
+    if dtype not in ('float32', 'float64'):
+        raise ValueError(f'Invalid dtype "{dtype}". Choose from float32, float64')
+    arrays = [(layer, kind, array(values, dtype=dtype)) for layer, kind, values in arrays]
+    entries, offset = [], 0
+    for layer, kind, values in arrays:
+        entries.append({'layer': layer, 'kind': kind, 'shape': list(values.shape), 'offset': offset})
+        offset += -(-values.nbytes // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+    header = json.dumps({'structure': structure, 'dtype': dtype, 'arrays': entries}).encode()
+    start = -(-(len(BINARY_MAGIC) + 8 + len(header)) // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+    with open(path, 'wb') as file:
+        file.write(BINARY_MAGIC + struct.pack('<Q', len(header)) + header)
+        for entry, (layer, kind, values) in zip(entries, arrays):
+            file.seek(start + entry['offset'])
+            file.write(values.tobytes())
+        file.truncate(start + offset)
+
+
+def read_binary(path: str) -> tuple[list[dict], dict]:
+    '''Função que abre uma rede no formato binário por memória mapeada.
+
+    Retorna a estrutura e um dicionário `(camada, tipo) -> array`, com os arrays sendo visões
+    somente leitura do arquivo.
+
+    Parâmetros:
+    - `path:` Caminho do arquivo;
+    '''
+    with open(path, 'rb') as file:
+        if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f'"{path}" is not a binary network file.')
+        size, = struct.unpack('<Q', file.read(8))
+        header = json.loads(file.read(size))
+    start = -(-(len(BINARY_MAGIC) + 8 + size) // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+    buffer = memmap(path, dtype=uint8, mode='r')
+    item = numpy_dtype(header['dtype'])
+    arrays = {}
+    for entry in header['arrays']:
+        count = 1
+        for dimension in entry['shape']:
+            count *= dimension
+        begin = start + entry['offset']
+        arrays[entry['layer'], entry['kind']] = buffer[begin:begin + count * item.itemsize].view(item).reshape(entry['shape'])
+    return header['structure'], arrays
+
+
+def convert_json(source: str, destination: str, dtype: Literal['float32', 'float64'] = 'float64'):
+    '''Função que converte uma rede no formato do `network.json` para o formato binário.
+
+    Parâmetros:
+    - `source:` Arquivo JSON;
+    - `destination:` Arquivo binário;
+    - `dtype:` Tipo dos números guardados (opcional);
+    '''
+    with open(source, 'r') as file:
+        Network(**json.load(file)).save(destination, dtype)
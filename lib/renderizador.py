@@ -0,0 +1,89 @@
+import pygame
+from lib.constantes import *
+from lib.perfil import secao
+
+
+class RenderizadorParcial:
+    '''Renderizador por retângulos sujos (dirty rectangles).
+
+    O fundo (cor, linhas, rótulos e placar) é composto uma vez em uma superfície própria. A cada
+    quadro só as regiões que mudaram são refeitas: as posições antigas das raquetes e da bola são
+    apagadas com o fundo, as novas são desenhadas, e apenas esses retângulos são enviados para
+    `pygame.display.update`. O placar só é recomposto quando muda.
+
+    Atributos:
+    - `jogo:` `Game` desenhado;
+    - `fundo:` Superfície com o fundo pré-composto;
+    - `placar:` Pontos desenhados no fundo, com os retângulos de cada número;
+    - `anteriores:` Retângulos desenhados no quadro anterior, apagados no próximo;
+    - `sujos:` Retângulos alterados no quadro atual;
+    '''
+    def __init__(self, jogo):
+        '''Método construtor.
+
+        Parâmetros:
+        - `jogo:` `Game` desenhado;
+        '''
+        self.jogo = jogo
+        self.fundo = pygame.Surface((LARGURA, ALTURA))
+        self.placar = None
+        self.anteriores = []
+        self.sujos = [pygame.Rect(0, 0, LARGURA, ALTURA)]
+        self.compose_background()
+        self.jogo.screen.blit(self.fundo, (0, 0))
+
+    def compose_background(self):
+        '''Método que desenha as partes estáticas no fundo.'''
+        self.fundo.fill('#202020')
+        pygame.draw.line(self.fundo, 'white', (0, 80), (LARGURA, 80))
+        pygame.draw.line(self.fundo, 'white', (LARGURA / 2, 0), (LARGURA / 2, 80))
+        self.jogo.textos.blit(self.fundo, 'Player', 35, 'white', (LARGURA / 4, 40))
+        self.jogo.textos.blit(self.fundo, 'Neural Network', 35, 'white', (3 * LARGURA / 4, 40))
+        self.update_score()
+
+    def update_score(self):
+        '''Método que recompõe as áreas do placar no fundo quando os pontos mudam.'''
+        pontos = (self.jogo.jogador1_pontos, self.jogo.jogador2_pontos)
+        if self.placar is not None and self.placar[0] == pontos:
+            return
+        areas = list(self.placar[1]) if self.placar is not None else []
+        for area in areas:
+            self.fundo.fill('#202020', area)
+        novas = []
+        for texto, centro in ((pontos[0], (LARGURA / 4, (ALTURA + 80) / 2)), (pontos[1], (3 * LARGURA / 4, (ALTURA + 80) / 2))):
+            superficie, retangulo = self.jogo.textos.render(str(texto), 200, '#303030', centro)
+            self.fundo.blit(superficie, retangulo)
+            novas.append(retangulo)
+        self.placar = pontos, novas
+        for area in areas + novas:
+            self.jogo.screen.blit(self.fundo, area, area)
+        self.sujos += areas + novas
+
+    def draw(self) -> list:
+        '''Método que desenha o quadro atual e retorna os retângulos que mudaram.'''
+        with secao(self.jogo.perfil, 'texto'):
+            self.update_score()
+        with secao(self.jogo.perfil, 'desenho'):
+            for area in self.anteriores:
+                self.jogo.screen.blit(self.fundo, area, area)
+            self.jogo.jogador1.draw(self.jogo.screen)
+            self.jogo.jogador2.draw(self.jogo.screen)
+            self.jogo.bola.draw(self.jogo.screen)
+            atuais = [pygame.Rect(sprite.rect.to_tuple()) for sprite in (self.jogo.jogador1, self.jogo.jogador2, self.jogo.bola)]
+        self.sujos += self.anteriores + atuais
+        self.anteriores = atuais
+        return self.sujos
+
+    def add_dirty(self, areas: list):
+        '''Método que marca áreas desenhadas por fora (ex.: overlay do perfil), para serem enviadas e apagadas no próximo quadro.
+
+        Parâmetros:
+        - `areas:` Lista de retângulos;
+        '''
+        self.sujos += areas
+        self.anteriores += areas
+
+    def flip(self):
+        '''Método que envia apenas os retângulos sujos para a tela e limpa a lista.'''
+        pygame.display.update(self.sujos)
+        self.sujos = []
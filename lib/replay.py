@@ -0,0 +1,109 @@
+import json, os, struct, zlib
+from lib.constantes import DIRETORIO_PRINCIPAL, FISICA_HZ, VELOCIDADE_BOLA
+from lib.rede_neural import Network
+from lib.simulacao import Simulacao, network_controller
+
+
+REPLAY_MAGIC = b'PONGRPL\x03'
+'''Assinatura do formato de replay. As versões 1 (sem velocidade e colisão) e 2 (velocidade em pixels por passo, a 60 Hz) ainda são lidas.'''
+
+
+class Replay:
+    '''Registro de uma partida: a semente e a entrada do jogador humano em cada quadro.
+
+    Com a semente, as direções da bola e a rede (inclusive pesos ocultos aleatórios) são as mesmas,
+    então repetir as entradas reconstrói a partida quadro a quadro. Cada quadro (passo da física)
+    ocupa um byte (ação + 1 nos bits 0-1, tecla pressionada no bit 2), e o arquivo é comprimido
+    com zlib. Os passos da física por segundo são gravados junto, porque a partida só se repete
+    com os mesmos passos.
+
+    Atributos:
+    - `seed:` Semente da partida;
+    - `entradas:` Um byte por quadro;
+    - `velocidade:` Velocidade da bola na partida, em pixels por segundo;
+    - `continua:` Se a partida usou colisão contínua;
+    - `hz:` Passos da física por segundo na partida;
+    '''
+    def __init__(self, seed: int, entradas: bytes = b'', velocidade: int = VELOCIDADE_BOLA, continua: bool = False, hz: int = FISICA_HZ):
+        '''Método construtor.
+
+        Parâmetros:
+        - `seed:` Semente da partida;
+        - `entradas:` Entradas já gravadas (opcional);
+        - `velocidade:` Velocidade da bola, em pixels por segundo (opcional);
+        - `continua:` Se a partida usa colisão contínua (opcional);
+        - `hz:` Passos da física por segundo (opcional);
+        '''
+        self.seed = seed
+        self.entradas = bytearray(entradas)
+        self.velocidade = velocidade
+        self.continua = continua
+        self.hz = hz
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def record(self, acao: int, iniciar: bool):
+        '''Método que grava a entrada de um quadro.
+
+        Parâmetros:
+        - `acao:` Ação do jogador;
+        - `iniciar:` Se alguma tecla estava pressionada;
+        '''
+        self.entradas.append((acao + 1) | (bool(iniciar) << 2))
+
+    def input(self, frame: int) -> tuple:
+        '''Método que retorna a entrada `(ação, iniciar)` de um quadro.
+
+        Parâmetros:
+        - `frame:` Número do quadro;
+        '''
+        entrada = self.entradas[frame]
+        return (entrada & 3) - 1, bool(entrada & 4)
+
+    def save(self, path: str):
+        '''Método que salva o replay.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        '''
+        with open(path, 'wb') as file:
+            file.write(REPLAY_MAGIC + struct.pack('<qIHH?', self.seed, len(self.entradas), self.velocidade, self.hz, self.continua) + zlib.compress(bytes(self.entradas), 9))
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        '''Método que abre um replay salvo por `save`.
+
+        Parâmetros:
+        - `path:` Caminho do arquivo;
+        '''
+        with open(path, 'rb') as file:
+            magic = file.read(len(REPLAY_MAGIC))
+            if magic == REPLAY_MAGIC:
+                seed, frames, velocidade, hz, continua = struct.unpack('<qIHH?', file.read(17))
+            elif magic == b'PONGRPL\x02':
+                seed, frames, velocidade, continua = struct.unpack('<qIH?', file.read(15))
+                velocidade, hz = velocidade * FISICA_HZ, FISICA_HZ
+            elif magic == b'PONGRPL\x01':
+                (seed, frames), velocidade, continua, hz = struct.unpack('<qI', file.read(12)), VELOCIDADE_BOLA, False, FISICA_HZ
+            else:
+                raise ValueError(f'"{path}" is not a replay file.')
+            entradas = zlib.decompress(file.read())
+        if len(entradas) != frames:
+            raise ValueError(f'Corrupted replay: expected {frames} frames, got {len(entradas)}.')
+        return cls(seed, entradas, velocidade, continua, hz)
+
+    def play(self, ate_frame: int | None = None, rede: str = os.path.join(DIRETORIO_PRINCIPAL, 'network.json')) -> Simulacao:
+        '''Método que reconstrói a partida sem tela até um quadro e retorna a simulação nesse ponto.
+
+        Parâmetros:
+        - `ate_frame:` Quantidade de quadros reproduzidos, por padrão todos (opcional);
+        - `rede:` Arquivo da rede usada pelo `PlayerIA` na gravação (opcional);
+        '''
+        with open(rede, 'r') as file:
+            controlador = network_controller(Network(**json.load(file), seed=self.seed).compile(), self.continua)
+        simulacao = Simulacao(seed=self.seed, velocidade=self.velocidade, continua=self.continua, hz=self.hz)
+        for frame in range(len(self) if ate_frame is None else min(ate_frame, len(self))):
+            acao, iniciar = self.input(frame)
+            simulacao.step(acao, controlador(simulacao.jogador2, simulacao.bola), iniciar)
+        return simulacao
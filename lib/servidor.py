@@ -0,0 +1,369 @@
+import asyncio, struct
+from numpy import array, stack
+from lib.constantes import *
+from lib.rede_neural import CompiledNetwork
+from lib.simulacao import Simulacao, network_action, network_inputs, PARADO
+from lib.trajetoria import Preditor
+
+
+ENTRAR, ACAO, ESTADO = 1, 2, 3
+'''Tipos das mensagens do protocolo, sempre o primeiro byte.'''
+
+MENSAGEM_ENTRAR = struct.Struct('<BIB')
+'''Cliente -> servidor, uma vez: tipo, partida e lado (1 esquerda, 2 direita, 0 espectador).'''
+
+MENSAGEM_ACAO = struct.Struct('<Bb?')
+'''Cliente -> servidor, quando a entrada muda: tipo, ação e se alguma tecla está pressionada.'''
+
+MENSAGEM_ESTADO = struct.Struct('<BIhhhhhhHH?')
+'''Servidor -> clientes, a cada passo: tipo, quadro, bola (x, y, vel_x, vel_y), raquetes (y), pontos e se a bola está em jogo.
+
+As posições são arredondadas para pixels e as velocidades são em pixels por segundo, então o
+estado não depende dos passos por segundo do servidor. O quadro é enviado módulo 2^32 e os
+pontos módulo 2^16: partidas permanentes passam desses limites, e os contadores voltam a zero
+em vez de interromper o servidor.
+'''
+
+CAMPOS_ESTADO = ('frame', 'bola_x', 'bola_y', 'vel_x', 'vel_y', 'jogador1_y', 'jogador2_y', 'jogador1_pontos', 'jogador2_pontos', 'start')
+'''Nomes dos campos de `MENSAGEM_ESTADO`, depois do tipo.'''
+
+LIMITE_BUFFER = 64 * MENSAGEM_ESTADO.size
+'''Bytes de estados ainda não enviados a partir dos quais um cliente lento é desconectado.'''
+
+
+class Partida:
+    '''Partida hospedada pelo servidor: a simulação, os clientes conectados e as raquetes da rede.
+
+    Atributos:
+    - `simulacao:` Simulação da partida;
+    - `permanente:` Se a partida continua existindo sem clientes;
+    - `jogadores:` Cliente de cada lado ocupado, `lado -> StreamWriter`;
+    - `espectadores:` Clientes que só recebem o estado;
+    - `entradas:` Última entrada `(ação, iniciar)` de cada jogador;
+    - `preditores:` `Preditor` de cada lado controlado pela rede;
+    - `estados:` Estado oculto da rede em cada lado controlado por ela;
+    - `frame:` Quadros simulados;
+    '''
+    def __init__(self, seed: int | None = None, velocidade: int = VELOCIDADE_BOLA, continua: bool = False, permanente: bool = False, hz: int = FISICA_HZ):
+        '''Método construtor.
+
+        Parâmetros:
+        - `seed:` Semente da partida (opcional);
+        - `velocidade:` Velocidade da bola, em pixels por segundo (opcional);
+        - `continua:` Usa colisão contínua (opcional);
+        - `permanente:` Mantém a partida sem clientes (opcional);
+        - `hz:` Passos da simulação por segundo (opcional);
+        '''
+        self.simulacao = Simulacao(seed=seed, velocidade=velocidade, continua=continua, hz=hz)
+        self.permanente = permanente
+        self.jogadores = {}
+        self.espectadores = []
+        self.entradas = {}
+        self.preditores = {1: Preditor(1, continua), 2: Preditor(2, continua)}
+        self.estados = {}
+        self.frame = 0
+
+    def ai_sides(self) -> list[int]:
+        '''Método que retorna os lados sem jogador conectado, que são controlados pela rede.'''
+        return [lado for lado in (1, 2) if lado not in self.jogadores]
+
+    def clients(self) -> list:
+        '''Método que retorna todos os clientes conectados: jogadores e espectadores.'''
+        return list(self.jogadores.values()) + self.espectadores
+
+    def state(self) -> bytes:
+        '''Método que monta a mensagem de estado da partida.'''
+        simulacao = self.simulacao
+        bola = simulacao.bola
+        return MENSAGEM_ESTADO.pack(ESTADO, self.frame % 2 ** 32, round(bola.rect.x), round(bola.rect.y), round(bola.vel_x * bola.hz), round(bola.vel_y * bola.hz), round(simulacao.jogador1.rect.y), round(simulacao.jogador2.rect.y), simulacao.jogador1_pontos % 2 ** 16, simulacao.jogador2_pontos % 2 ** 16, simulacao.start)
+
+
+class Servidor:
+    '''Servidor asyncio que hospeda várias partidas sem tela ao mesmo tempo.
+
+    A cada passo, as raquetes controladas pela rede em todas as partidas são decididas com uma
+    única chamada de `forward_batch` (cada uma com o próprio estado oculto e preditor), todas as
+    simulações avançam um quadro e o estado de cada partida é enviado aos seus clientes.
+
+    Os clientes se conectam por TCP ou socket Unix e usam o protocolo binário de `MENSAGEM_*`:
+    um `ENTRAR` para escolher a partida e o lado, depois um `ACAO` sempre que a entrada muda.
+    Uma partida que ainda não existe é criada com a semente igual ao seu número, e os lados sem
+    jogador são controlados pela rede.
+
+    Atributos:
+    - `rede:` Rede que controla as raquetes sem jogador;
+    - `hz:` Passos da simulação por segundo;
+    - `velocidade:` Velocidade da bola das partidas criadas, em pixels por segundo;
+    - `continua:` Se as partidas criadas usam colisão contínua;
+    - `partidas:` Partidas hospedadas, `número -> Partida`;
+    - `frames:` Passos dados desde o início;
+    - `servidores:` Servidores asyncio abertos (privado);
+    - `estado_inicial:` Estado oculto da rede no início de uma partida (privado);
+    '''
+    def __init__(self, rede: CompiledNetwork, hz: int = FISICA_HZ, velocidade: int = VELOCIDADE_BOLA, continua: bool = False):
+        '''Método construtor.
+
+        Parâmetros:
+        - `rede:` Rede que controla as raquetes sem jogador;
+        - `hz:` Passos da simulação por segundo (opcional);
+        - `velocidade:` Velocidade da bola, em pixels por segundo (opcional);
+        - `continua:` Usa colisão contínua (opcional);
+
+        ```
+        >>> servidor = Servidor(Network(**json.load(file)).compile())
+        >>> await servidor.start_tcp('127.0.0.1', 5000)
+        >>> await servidor.run()
+        ```
+        '''
+        self.rede = rede
+        self.hz = hz
+        self.velocidade = velocidade
+        self.continua = continua
+        self.partidas = {}
+        self.frames = 0
+        self.__servidores = []
+        rede.reset_hidden_states()
+        self.__estado_inicial = rede.get_hidden_states()
+
+    def create_match(self, numero: int, permanente: bool = False) -> Partida:
+        '''Método que cria uma partida (ou retorna a existente) com a semente igual ao número.
+
+        Parâmetros:
+        - `numero:` Número da partida;
+        - `permanente:` Mantém a partida sem clientes, ex.: partidas só entre redes (opcional);
+        '''
+        if numero not in self.partidas:
+            self.partidas[numero] = Partida(numero, self.velocidade, self.continua, permanente, self.hz)
+        return self.partidas[numero]
+
+    def decide(self) -> dict:
+        '''Método que decide as ações de todas as raquetes da rede com uma única inferência em lote.
+
+        Retorna `(número da partida, lado) -> ação`.
+        '''
+        lados = [(numero, partida, lado) for numero, partida in self.partidas.items() for lado in partida.ai_sides()]
+        if not lados:
+            return {}
+        inputs = []
+        for numero, partida, lado in lados:
+            simulacao = partida.simulacao
+            raquete = simulacao.jogador1 if lado == 1 else simulacao.jogador2
+            inputs.append(network_inputs(raquete, simulacao.bola, partida.preditores[lado] if self.rede.get_inputs() == 2 else None))
+        # Cada linha do lote carrega o estado oculto da sua raquete.
+        estados = [partida.estados.get(lado, self.__estado_inicial) for numero, partida, lado in lados]
+        self.rede.set_hidden_states([None if inicial is None else stack([estado[idx] for estado in estados]) for idx, inicial in enumerate(self.__estado_inicial)])
+        saidas = self.rede.forward_batch(array(inputs))
+        novos = self.rede.get_hidden_states()
+        acoes = {}
+        for linha, (numero, partida, lado) in enumerate(lados):
+            partida.estados[lado] = [None if estado is None else estado[linha] for estado in novos]
+            acoes[numero, lado] = network_action(saidas[linha])
+        return acoes
+
+    def tick(self):
+        '''Método que avança todas as partidas um quadro e envia o estado delas aos clientes.'''
+        acoes = self.decide()
+        for numero, partida in self.partidas.items():
+            entrada1, entrada2 = partida.entradas.get(1, (PARADO, False)), partida.entradas.get(2, (PARADO, False))
+            acao1 = acoes.get((numero, 1), entrada1[0])
+            acao2 = acoes.get((numero, 2), entrada2[0])
+            # Sem jogadores a bola está sempre em jogo; com jogadores, ela entra quando um deles aperta uma tecla.
+            iniciar = not partida.jogadores or entrada1[1] or entrada2[1]
+            partida.simulacao.step(acao1, acao2, iniciar)
+            partida.frame += 1
+            clientes = partida.clients()
+            if clientes:
+                mensagem = partida.state()
+                for writer in clientes:
+                    if writer.transport.get_write_buffer_size() > LIMITE_BUFFER:
+                        writer.close()
+                    else:
+                        writer.write(mensagem)
+        self.frames += 1
+
+    async def run(self, frames: int | None = None):
+        '''Método que executa os passos no ritmo de `hz`, para sempre ou por alguns quadros.
+
+        Se o servidor se atrasar mais que `ATRASO_MAXIMO`, o tempo perdido é descartado em vez de
+        ser compensado com uma rajada de passos.
+
+        Parâmetros:
+        - `frames:` Quantidade de passos (opcional);
+        '''
+        loop = asyncio.get_running_loop()
+        proximo = loop.time()
+        inicio = self.frames
+        while frames is None or self.frames - inicio < frames:
+            self.tick()
+            proximo += 1 / self.hz
+            agora = loop.time()
+            if agora - proximo > ATRASO_MAXIMO:
+                proximo = agora
+            await asyncio.sleep(max(0, proximo - agora))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''Método que atende um cliente: lê o `ENTRAR` e depois as entradas até ele desconectar.
+
+        Um lado já ocupado ou uma mensagem inválida encerram a conexão.
+
+        Parâmetros:
+        - `reader:` Leitura da conexão;
+        - `writer:` Escrita da conexão;
+        '''
+        numero, lado = None, None
+        try:
+            tipo, numero, lado = MENSAGEM_ENTRAR.unpack(await reader.readexactly(MENSAGEM_ENTRAR.size))
+            if tipo != ENTRAR or lado not in (0, 1, 2):
+                return
+            partida = self.create_match(numero)
+            if lado == 0:
+                partida.espectadores.append(writer)
+            elif lado in partida.jogadores:
+                return
+            else:
+                partida.jogadores[lado] = writer
+                partida.estados.pop(lado, None)
+            writer.write(partida.state())
+            while True:
+                tipo, acao, iniciar = MENSAGEM_ACAO.unpack(await reader.readexactly(MENSAGEM_ACAO.size))
+                if tipo != ACAO:
+                    return
+                if lado:
+                    partida.entradas[lado] = (max(-1, min(1, acao)), iniciar)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if numero is not None:
+                self.leave(numero, lado, writer)
+            writer.close()
+
+    def leave(self, numero: int, lado: int, writer: asyncio.StreamWriter):
+        '''Método que tira um cliente da partida, removendo a partida se ela ficar vazia e não for permanente.
+
+        Parâmetros:
+        - `numero:` Número da partida do cliente;
+        - `lado:` Lado do cliente, 0 para espectador;
+        - `writer:` Escrita da conexão;
+        '''
+        partida = self.partidas.get(numero)
+        if partida is None:
+            return
+        if lado == 0 and writer in partida.espectadores:
+            partida.espectadores.remove(writer)
+        elif partida.jogadores.get(lado) is writer:
+            del partida.jogadores[lado]
+            partida.entradas.pop(lado, None)
+        if not partida.permanente and not partida.clients():
+            del self.partidas[numero]
+
+    async def start_tcp(self, host: str = '127.0.0.1', porta: int = 0) -> int:
+        '''Método que começa a aceitar clientes por TCP e retorna a porta usada.
+
+        Parâmetros:
+        - `host:` Endereço (opcional);
+        - `porta:` Porta, 0 para uma livre (opcional);
+        '''
+        servidor = await asyncio.start_server(self.handle, host, porta)
+        self.__servidores.append(servidor)
+        return servidor.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str):
+        '''Método que começa a aceitar clientes por um socket Unix.
+
+        Parâmetros:
+        - `path:` Caminho do socket;
+        '''
+        self.__servidores.append(await asyncio.start_unix_server(self.handle, path))
+
+    async def close(self):
+        '''Método que para de aceitar clientes e desconecta os atuais.'''
+        for servidor in self.__servidores:
+            servidor.close()
+        for partida in self.partidas.values():
+            for writer in partida.clients():
+                writer.close()
+        for servidor in self.__servidores:
+            await servidor.wait_closed()
+        self.__servidores = []
+
+
+class Cliente:
+    '''Cliente do `Servidor`: um jogador (humano ou robô) ou um espectador de uma partida.
+
+    Atributos:
+    - `reader:` Leitura da conexão;
+    - `writer:` Escrita da conexão;
+    - `lado:` Lado do cliente, 0 para espectador;
+    '''
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''Método construtor. Use `connect` ou `connect_unix`.
+
+        Parâmetros:
+        - `reader:` Leitura da conexão;
+        - `writer:` Escrita da conexão;
+        '''
+        self.reader = reader
+        self.writer = writer
+        self.lado = None
+
+    @classmethod
+    async def connect(cls, host: str, porta: int) -> 'Cliente':
+        '''Método que se conecta a um servidor por TCP.
+
+        Parâmetros:
+        - `host:` Endereço do servidor;
+        - `porta:` Porta do servidor;
+        '''
+        return cls(*await asyncio.open_connection(host, porta))
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> 'Cliente':
+        '''Método que se conecta a um servidor por socket Unix.
+
+        Parâmetros:
+        - `path:` Caminho do socket;
+        '''
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def join(self, partida: int, lado: int) -> dict:
+        '''Método que entra em uma partida e retorna o primeiro estado recebido.
+
+        Parâmetros:
+        - `partida:` Número da partida;
+        - `lado:` 1 para a esquerda, 2 para a direita, 0 para só assistir;
+
+        ```
+        >>> cliente = await Cliente.connect('127.0.0.1', 5000)
+        >>> estado = await cliente.join(7, 1)
+        ```
+        '''
+        self.lado = lado
+        self.writer.write(MENSAGEM_ENTRAR.pack(ENTRAR, partida, lado))
+        try:
+            return await self.state()
+        except asyncio.IncompleteReadError:
+            raise ConnectionError(f'The server refused side {lado} of match {partida}.') from None
+
+    def send(self, acao: int, iniciar: bool = False):
+        '''Método que envia a entrada do jogador, mantida pelo servidor até a próxima.
+
+        Parâmetros:
+        - `acao:` `SOBE`, `PARADO` ou `DESCE`;
+        - `iniciar:` Se alguma tecla está pressionada (opcional);
+        '''
+        self.writer.write(MENSAGEM_ACAO.pack(ACAO, acao, iniciar))
+
+    async def state(self) -> dict:
+        '''Método que espera o próximo estado da partida, com os campos de `CAMPOS_ESTADO`.'''
+        tipo, *valores = MENSAGEM_ESTADO.unpack(await self.reader.readexactly(MENSAGEM_ESTADO.size))
+        if tipo != ESTADO:
+            raise ConnectionError(f'Unexpected message type {tipo}.')
+        return dict(zip(CAMPOS_ESTADO, valores))
+
+    async def close(self):
+        '''Método que encerra a conexão.'''
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
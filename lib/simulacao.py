@@ -0,0 +1,397 @@
+import random
+from typing import Callable
+from lib.constantes import *
+from lib.trajetoria import Preditor
+
+
+SOBE, PARADO, DESCE = -1, 0, 1
+
+SUBPIXEL = 1024
+'''Frações de pixel dos passos da física. Os deslocamentos por passo são múltiplos de `1 / SUBPIXEL`,
+então as somas das posições são exatas em ponto flutuante e batem com a forma fechada de `lib.trajetoria`.'''
+
+
+def step_size(velocidade: float, hz: int) -> float:
+    '''Função que retorna quantos pixels um objeto anda em cada passo da física, arredondado para `1 / SUBPIXEL`.
+
+    Parâmetros:
+    - `velocidade:` Velocidade em pixels por segundo;
+    - `hz:` Passos da física por segundo;
+    '''
+    return round(velocidade * SUBPIXEL / hz) / SUBPIXEL
+
+
+class Retangulo:
+    '''Retângulo com a mesma semântica do `pygame.Rect` usada pelo jogo, sem depender do pygame.
+
+    A posição pode ser fracionária, para os objetos andarem menos de um pixel por passo quando a
+    física roda com muitos passos por segundo; ela só é arredondada para desenhar.
+
+    Atributos:
+    - `x:` Posição horizontal do canto superior esquerdo;
+    - `y:` Posição vertical do canto superior esquerdo;
+    - `width:` Largura;
+    - `height:` Altura;
+    '''
+    __slots__ = ['x', 'y', 'width', 'height']
+
+    def __init__(self, x: float, y: float, width: int, height: int):
+        '''Método construtor.
+
+        Parâmetros:
+        - `x:` Posição horizontal;
+        - `y:` Posição vertical;
+        - `width:` Largura;
+        - `height:` Altura;
+        '''
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+    def __repr__(self) -> str:
+        return f'<Retangulo({self.x}, {self.y}, {self.width}, {self.height})>'
+
+    @property
+    def left(self) -> float:
+        return self.x
+
+    @property
+    def right(self) -> float:
+        return self.x + self.width
+
+    @property
+    def top(self) -> float:
+        return self.y
+
+    @property
+    def bottom(self) -> float:
+        return self.y + self.height
+
+    @property
+    def centerx(self) -> float:
+        return self.x + self.width // 2
+
+    @property
+    def centery(self) -> float:
+        return self.y + self.height // 2
+
+    @centery.setter
+    def centery(self, value: float):
+        self.y = value - self.height // 2
+
+    @property
+    def center(self) -> tuple:
+        return self.centerx, self.centery
+
+    @center.setter
+    def center(self, pos: tuple):
+        self.x = pos[0] - self.width // 2
+        self.y = pos[1] - self.height // 2
+
+    def colliderect(self, other: 'Retangulo') -> bool:
+        '''Método que verifica se há sobreposição com outro retângulo.
+
+        Parâmetros:
+        - `other:` Outro retângulo;
+        '''
+        return (self.width > 0 and self.height > 0 and other.width > 0 and other.height > 0
+                and self.x < other.x + other.width and other.x < self.x + self.width
+                and self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def to_tuple(self) -> tuple:
+        '''Método que retorna o retângulo como `(x, y, largura, altura)` em pixels inteiros, aceito pelo pygame.'''
+        return round(self.x), round(self.y), self.width, self.height
+
+
+def time_of_impact(movel: Retangulo, destino: tuple, alvo: Retangulo) -> float | None:
+    '''Função que calcula, pelo método dos slabs, em que fração do passo um retângulo em movimento passa a sobrepor outro parado.
+
+    Retorna `None` se não houver sobreposição durante o passo.
+
+    Parâmetros:
+    - `movel:` Retângulo na posição inicial;
+    - `destino:` Posição `(x, y)` final do retângulo;
+    - `alvo:` Retângulo parado;
+    '''
+    entrada, saida = 0.0, 1.0
+    for inicio, fim, minimo, maximo in ((movel.x, destino[0], alvo.left - movel.width, alvo.right), (movel.y, destino[1], alvo.top - movel.height, alvo.bottom)):
+        if inicio == fim:
+            if not minimo < inicio < maximo:
+                return None
+            continue
+        t1, t2 = (minimo - inicio) / (fim - inicio), (maximo - inicio) / (fim - inicio)
+        entrada, saida = max(entrada, min(t1, t2)), min(saida, max(t1, t2))
+        if entrada >= saida:
+            return None
+    return entrada
+
+
+class Raquete:
+    '''Raquete do jogo, apenas com as regras de movimento.
+
+    Atributos:
+    - `rect:` Retângulo de colisão;
+    - `passo:` Pixels andados em cada passo da física, `VELOCIDADE_RAQUETE / hz` (veja `step_size`);
+    '''
+    def __init__(self, pos: tuple, hz: int = FISICA_HZ):
+        '''Método construtor.
+
+        Parâmetros:
+        - `pos:` Posição que a raquete ficará;
+        - `hz:` Passos da física por segundo (opcional);
+        '''
+        self.rect = Retangulo(*pos, 10, 100)
+        self.passo = step_size(VELOCIDADE_RAQUETE, hz)
+
+    def move(self, acao: int):
+        '''Método que move a raquete, respeitando os limites da quadra.
+
+        Parâmetros:
+        - `acao:` `SOBE`, `PARADO` ou `DESCE`;
+        '''
+        if acao == SOBE and self.rect.top > 80:
+            self.rect.y -= self.passo
+        elif acao == DESCE and self.rect.bottom < ALTURA:
+            self.rect.y += self.passo
+
+
+class BolaSimulada:
+    '''Bola do jogo, apenas com as regras de movimento.
+
+    Atributos:
+    - `rect:` Retângulo de colisão;
+    - `vel_x:` Deslocamento horizontal em cada passo da física;
+    - `vel_y:` Deslocamento vertical em cada passo da física;
+    - `rng:` Gerador das direções (`random.Random` ou o módulo `random` global);
+    - `saques:` Quantidade de vezes que a bola foi recolocada no centro;
+    - `velocidade:` Velocidade da bola em cada eixo, em pixels por segundo;
+    - `hz:` Passos da física por segundo;
+    '''
+    def __init__(self, pos: tuple, rng: random.Random | None = None, velocidade: int = VELOCIDADE_BOLA, hz: int = FISICA_HZ):
+        '''Método construtor.
+
+        Parâmetros:
+        - `pos:` Posição inical da bola;
+        - `rng:` Gerador das direções, para partidas reproduzíveis (opcional);
+        - `velocidade:` Velocidade da bola em cada eixo, em pixels por segundo (opcional);
+        - `hz:` Passos da física por segundo (opcional);
+        '''
+        self.rect = Retangulo(0, 0, 10, 10)
+        self.rng = rng if rng is not None else random
+        self.velocidade = velocidade
+        self.hz = hz
+        self.saques = 0
+        self.new_direction(pos)
+
+    def new_direction(self, pos: tuple):
+        '''Método que define uma nova posição e direção para a bola.
+
+        Parâmetros:
+        - `pos:` Nova posição;
+        '''
+        self.rect.center = pos
+        self.saques += 1
+        passo = step_size(self.velocidade, self.hz)
+        self.vel_x, self.vel_y = self.rng.choice([-passo, passo]), self.rng.choice([-passo, passo])
+
+    def update(self):
+        '''Método que atualiza a bola.'''
+        self.rect.x += self.vel_x
+        self.rect.y += self.vel_y
+        if self.rect.top + self.vel_y < 80 or self.rect.bottom + self.vel_y > ALTURA:
+            self.vel_y *= -1
+
+    def sweep(self, raquetes: list[Raquete]):
+        '''Método que move a bola com colisão contínua, para velocidades maiores que as raquetes.
+
+        A bola é refletida exatamente nas paredes, e o caminho do passo é testado contra cada
+        raquete com `time_of_impact`; se ele cruzar a face de uma raquete, a bola é espelhada
+        nessa face e a velocidade horizontal é invertida. Assim a bola nunca atravessa uma raquete,
+        qualquer que seja a velocidade.
+
+        Parâmetros:
+        - `raquetes:` Raquetes do jogo;
+        '''
+        x, y = self.rect.x + self.vel_x, self.rect.y + self.vel_y
+        if y < 80:
+            y, self.vel_y = 160 - y, -self.vel_y
+        elif y + self.rect.height > ALTURA:
+            y, self.vel_y = 2 * (ALTURA - self.rect.height) - y, -self.vel_y
+        for raquete in raquetes:
+            if self.vel_x > 0 and self.rect.right <= raquete.rect.left:
+                face = raquete.rect.left - self.rect.width
+            elif self.vel_x < 0 and self.rect.left >= raquete.rect.right:
+                face = raquete.rect.right
+            else:
+                continue
+            if time_of_impact(self.rect, (x, y), raquete.rect) is not None:
+                x, self.vel_x = 2 * face - x, -self.vel_x
+                break
+        self.rect.x, self.rect.y = x, y
+
+
+class Simulacao:
+    '''Núcleo do jogo sem tela, relógio ou teclado: física da bola, raquetes, colisões e pontuação.
+
+    Pode ser avançado tão rápido quanto a CPU permitir. O `Game` do pygame é apenas um
+    renderizador em cima dele.
+
+    Atributos:
+    - `jogador1:` Raquete da esquerda;
+    - `jogador2:` Raquete da direita;
+    - `bola:` Bola;
+    - `jogador1_pontos:` Pontos do primeiro jogador;
+    - `jogador2_pontos:` Pontos do segundo jogador;
+    - `start:` Se a bola já está em jogo;
+    - `seed:` Semente da partida, ou `None`;
+    - `continua:` Se a bola usa colisão contínua (`BolaSimulada.sweep`) em vez do teste de sobreposição;
+    - `hz:` Passos da física por segundo das raquetes e da bola criadas aqui;
+    '''
+    def __init__(self, jogador1: Raquete | None = None, jogador2: Raquete | None = None, bola: BolaSimulada | None = None, seed: int | None = None, velocidade: int = VELOCIDADE_BOLA, continua: bool = False, hz: int = FISICA_HZ):
+        '''Método construtor.
+
+        Parâmetros:
+        - `jogador1:` Raquete da esquerda (opcional);
+        - `jogador2:` Raquete da direita (opcional);
+        - `bola:` Bola (opcional);
+        - `seed:` Semente das direções da bola criada aqui; sem ela é usado o `random` global (opcional);
+        - `velocidade:` Velocidade da bola criada aqui, em pixels por segundo (opcional);
+        - `continua:` Usa colisão contínua, necessária quando a bola anda mais de 20 pixels por passo (`velocidade / hz`) (opcional);
+        - `hz:` Passos da física por segundo; a velocidade do jogo não muda, só a precisão dos passos (opcional);
+        '''
+        self.seed = seed
+        self.continua = continua
+        self.hz = hz
+        self.jogador1 = jogador1 or Raquete((0, 290), hz)
+        self.jogador2 = jogador2 or Raquete((LARGURA - 10, 290), hz)
+        self.bola = bola or BolaSimulada((LARGURA // 2, (ALTURA + 80) // 2), random.Random(seed) if seed is not None else None, velocidade, hz)
+        self.jogador1_pontos = 0
+        self.jogador2_pontos = 0
+        self.start = False
+
+    def step(self, acao1: int, acao2: int, iniciar: bool = False):
+        '''Método que avança a simulação em um quadro.
+
+        Parâmetros:
+        - `acao1:` Ação da raquete da esquerda;
+        - `acao2:` Ação da raquete da direita;
+        - `iniciar:` Se a bola deve entrar em jogo (no jogo, qualquer tecla pressionada) (opcional);
+        '''
+        self.update_physics(acao1, acao2, iniciar)
+        self.check_collision()
+
+    def update_physics(self, acao1: int, acao2: int, iniciar: bool = False):
+        '''Método que move as raquetes e a bola e verifica os pontos, sem as colisões.
+
+        Parâmetros:
+        - `acao1:` Ação da raquete da esquerda;
+        - `acao2:` Ação da raquete da direita;
+        - `iniciar:` Se a bola deve entrar em jogo (opcional);
+        '''
+        self.jogador1.move(acao1)
+        self.jogador2.move(acao2)
+        if iniciar:
+            self.start = True
+        if self.start and self.continua:
+            self.bola.sweep([self.jogador1, self.jogador2])
+        elif self.start:
+            self.bola.update()
+        self.check_score()
+
+    def check_score(self):
+        '''Método que verifica se a bola saiu da quadra, marcando o ponto e recolocando a bola.'''
+        if self.bola.rect.right < 0:
+            self.start = False
+            self.bola.new_direction((LARGURA // 2, (ALTURA + 80) // 2))
+            self.jogador2_pontos += 1
+            self.jogador1.rect.centery = (ALTURA + 80) // 2
+        elif self.bola.rect.left > LARGURA:
+            self.start = False
+            self.bola.new_direction((LARGURA // 2, (ALTURA + 80) // 2))
+            self.jogador1_pontos += 1
+            self.jogador1.rect.centery = (ALTURA + 80) // 2
+
+    def check_collision(self):
+        '''Método que rebate a bola quando ela encosta em uma das raquetes. Com colisão contínua, isso já é feito ao mover a bola.'''
+        if self.continua:
+            return
+        if self.jogador1.rect.colliderect(self.bola.rect) or self.jogador2.rect.colliderect(self.bola.rect):
+            self.bola.vel_x *= -1
+
+    def simulate(self, frames: int, controlador1: Callable[[Raquete, BolaSimulada], int], controlador2: Callable[[Raquete, BolaSimulada], int], gravador=None):
+        '''Método que avança a simulação vários quadros, com a bola sempre em jogo.
+
+        Parâmetros:
+        - `frames:` Quantidade de quadros;
+        - `controlador1:` Função `(raquete, bola) -> ação` da raquete da esquerda;
+        - `controlador2:` Função `(raquete, bola) -> ação` da raquete da direita;
+        - `gravador:` `GravadorDataset` que recebe o estado e a ação das duas raquetes em cada quadro (opcional);
+
+        ```
+        >>> Simulacao().simulate(100_000, tracking_controller, network_controller(rede))
+        ```
+        '''
+        for frame in range(frames):
+            acao1, acao2 = controlador1(self.jogador1, self.bola), controlador2(self.jogador2, self.bola)
+            if gravador is not None:
+                gravador.record(1, self.jogador1, self.bola, acao1)
+                gravador.record(2, self.jogador2, self.bola, acao2)
+            self.step(acao1, acao2, True)
+
+
+def network_action(action: list) -> int:
+    '''Função que converte a saída da rede (sobe, desce) em uma ação da raquete.
+
+    Parâmetros:
+    - `action:` Saída da rede neural;
+    '''
+    if not all(action):
+        if action[0]:
+            return SOBE
+        if action[1]:
+            return DESCE
+    return PARADO
+
+
+def network_inputs(raquete: Raquete, bola: BolaSimulada, preditor: Preditor | None = None) -> list:
+    '''Função que monta a entrada da rede: a distância até a bola e, com um preditor, a distância até onde ela vai chegar.
+
+    Parâmetros:
+    - `raquete:` Raquete controlada;
+    - `bola:` Bola;
+    - `preditor:` `Preditor` do lado da raquete, para redes com duas entradas (opcional);
+    '''
+    if preditor is None:
+        return [raquete.rect.centery - bola.rect.centery]
+    return [raquete.rect.centery - bola.rect.centery, raquete.rect.centery - preditor.intercept(bola)]
+
+
+def network_controller(rede, continua: bool = False) -> Callable[[Raquete, BolaSimulada], int]:
+    '''Função que cria um controlador que decide as ações com a rede neural, como o `PlayerIA`.
+
+    Redes com duas entradas também recebem a distância até a altura prevista da bola.
+
+    Parâmetros:
+    - `rede:` `Network` ou `CompiledNetwork`;
+    - `continua:` Se a simulação usa colisão contínua, para a previsão seguir as mesmas reflexões (opcional);
+    '''
+    preditores = {}
+    def controlador(raquete: Raquete, bola: BolaSimulada) -> int:
+        preditor = None
+        if rede.get_inputs() == 2:
+            lado = 1 if raquete.rect.centerx < LARGURA // 2 else 2
+            preditor = preditores.setdefault(lado, Preditor(lado, continua))
+        return network_action(rede.forward(network_inputs(raquete, bola, preditor)))
+    return controlador
+
+
+def tracking_controller(raquete: Raquete, bola: BolaSimulada) -> int:
+    '''Controlador simples que segue a altura da bola.
+
+    Parâmetros:
+    - `raquete:` Raquete controlada;
+    - `bola:` Bola;
+    '''
+    if bola.rect.centery < raquete.rect.centery:
+        return SOBE
+    if bola.rect.centery > raquete.rect.centery:
+        return DESCE
+    return PARADO
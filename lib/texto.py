@@ -0,0 +1,77 @@
+import os
+from collections import OrderedDict
+from lib.constantes import DIRETORIO_PRINCIPAL
+
+
+FONTE = os.path.join(DIRETORIO_PRINCIPAL, 'font.TTF')
+'''Fonte do jogo (04b19), distribuída junto com o código.'''
+
+
+class CacheTexto:
+    '''Cache de fontes e de textos já renderizados.
+
+    As fontes são carregadas uma única vez por tamanho, e cada texto renderizado fica guardado
+    em um LRU. Assim, textos que não mudam (rótulos, placar parado) custam apenas uma consulta
+    ao dicionário por quadro, e só são renderizados de novo quando o conteúdo muda.
+
+    Atributos:
+    - `capacidade:` Quantidade máxima de textos guardados;
+    - `fontes:` Fontes carregadas, por tamanho (privado);
+    - `textos:` LRU de `(texto, tamanho, cor, centro) -> (superfície, retângulo)` (privado);
+    '''
+    def __init__(self, capacidade: int = 64, fonte: str = FONTE):
+        '''Método construtor.
+
+        Parâmetros:
+        - `capacidade:` Quantidade máxima de textos guardados (opcional);
+        - `fonte:` Caminho da fonte (opcional);
+        '''
+        self.capacidade = capacidade
+        self.__fonte = fonte
+        self.__fontes = {}
+        self.__textos = OrderedDict()
+
+    def font(self, tamanho: int):
+        '''Método que retorna a fonte no tamanho pedido, carregando-a apenas na primeira vez.
+
+        Parâmetros:
+        - `tamanho:` Tamanho da fonte;
+        '''
+        if tamanho not in self.__fontes:
+            import pygame
+            self.__fontes[tamanho] = pygame.font.Font(self.__fonte, tamanho)
+        return self.__fontes[tamanho]
+
+    def render(self, texto: str, tamanho: int, cor: str, centro: tuple) -> tuple:
+        '''Método que retorna a superfície do texto e o retângulo centralizado, renderizando só se não estiver no cache.
+
+        Parâmetros:
+        - `texto:` Texto;
+        - `tamanho:` Tamanho da fonte;
+        - `cor:` Cor do texto;
+        - `centro:` Centro do texto na tela;
+        '''
+        chave = (texto, tamanho, cor, centro)
+        if chave in self.__textos:
+            self.__textos.move_to_end(chave)
+            return self.__textos[chave]
+        superficie = self.font(tamanho).render(texto, True, cor)
+        self.__textos[chave] = superficie, superficie.get_rect(center=centro)
+        if len(self.__textos) > self.capacidade:
+            self.__textos.popitem(last=False)
+        return self.__textos[chave]
+
+    def blit(self, screen, texto: str, tamanho: int, cor: str, centro: tuple):
+        '''Método que desenha o texto centralizado na tela, usando o cache.
+
+        Parâmetros:
+        - `screen:` Tela do jogo;
+        - `texto:` Texto;
+        - `tamanho:` Tamanho da fonte;
+        - `cor:` Cor do texto;
+        - `centro:` Centro do texto na tela;
+        '''
+        screen.blit(*self.render(texto, tamanho, cor, centro))
+
+    def __len__(self) -> int:
+        return len(self.__textos)
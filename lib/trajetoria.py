@@ -0,0 +1,113 @@
+from numpy import maximum, where, sign
+from lib.constantes import *
+
+
+def fold(y, vel_y, frames, continua: bool = False):
+    '''Função que retorna o topo da bola depois de alguns quadros, com as reflexões nas paredes em forma fechada.
+
+    A bola só se move em passos de `|vel_y|` (inteiros ou não) e inverte a direção antes de passar do topo (80) ou
+    do chão (`ALTURA`), então suas posições formam uma onda triangular entre o menor e o maior
+    ponto alcançável. Com colisão contínua (`BolaSimulada.sweep`) a bola é espelhada exatamente
+    nas paredes, e a onda vai de 80 a `ALTURA - 10`. Aceita números ou arrays do NumPy.
+
+    Parâmetros:
+    - `y:` Topo atual da bola;
+    - `vel_y:` Velocidade vertical;
+    - `frames:` Quantidade de quadros;
+    - `continua:` Se a bola usa colisão contínua (opcional);
+    '''
+    if continua:
+        altura = ALTURA - 90
+        posicao = (y - 80 + vel_y * frames) % (2 * altura)
+        return 80 + altura - abs(altura - posicao)
+    passo = where(vel_y != 0, abs(vel_y), 1)
+    minimo = y - passo * ((y - 80) // passo)
+    intervalos = maximum((ALTURA - 10 - minimo) // passo, 1)
+    posicao = (y - minimo) // passo + sign(vel_y) * frames
+    posicao %= 2 * intervalos
+    return minimo + passo * (intervalos - abs(intervalos - posicao))
+
+
+def frames_until(x, vel_x, lado: int, continua: bool = False):
+    '''Função que retorna quantos quadros faltam para a bola alcançar a coluna da raquete de um lado.
+
+    Se a bola estiver indo para o outro lado, supõe que a raquete de lá a devolva: sem colisão
+    contínua ela volta de onde parou, e com ela é espelhada na face da raquete. Aceita números
+    ou arrays do NumPy.
+
+    Parâmetros:
+    - `x:` Canto esquerdo atual da bola;
+    - `vel_x:` Velocidade horizontal;
+    - `lado:` 1 para a esquerda, 2 para a direita;
+    - `continua:` Se a bola usa colisão contínua (opcional);
+    '''
+    passo = where(vel_x != 0, abs(vel_x), 1)
+    esquerda, direita = 10, LARGURA - 20
+    if lado == 1:
+        ida = maximum((x - esquerda) // passo + 1, 0)
+        volta = (direita - x) // passo + 1
+        rebote = x + passo * volta
+        if continua:
+            rebote = 2 * direita - rebote
+        return where(vel_x < 0, ida, volta + (rebote - esquerda) // passo + 1)
+    ida = maximum((direita - x) // passo + 1, 0)
+    volta = (x - esquerda) // passo + 1
+    rebote = x - passo * volta
+    if continua:
+        rebote = 2 * esquerda - rebote
+    return where(vel_x > 0, ida, volta + (direita - rebote) // passo + 1)
+
+
+def intercept(x, y, vel_x, vel_y, lado: int, continua: bool = False):
+    '''Função que retorna a altura (centro) em que a bola chegará à raquete de um lado, em O(1).
+
+    Parâmetros:
+    - `x:` Canto esquerdo atual da bola;
+    - `y:` Topo atual da bola;
+    - `vel_x:` Velocidade horizontal;
+    - `vel_y:` Velocidade vertical;
+    - `lado:` 1 para a esquerda, 2 para a direita;
+    - `continua:` Se a bola usa colisão contínua (opcional);
+
+    ```
+    >>> intercept(simulacao.bola_x, simulacao.bola_y, simulacao.vel_x, simulacao.vel_y, 2)
+    ```
+    '''
+    return fold(y, vel_y, frames_until(x, vel_x, lado, continua), continua) + 5
+
+
+class Preditor:
+    '''Previsão da altura em que a bola chegará a uma raquete, guardada até a trajetória mudar.
+
+    As batidas nas paredes já fazem parte da previsão, então ela só é refeita quando a velocidade
+    horizontal muda (batida em uma raquete) ou a bola é sacada de novo.
+
+    Atributos:
+    - `lado:` 1 para a esquerda, 2 para a direita;
+    - `continua:` Se a bola usa colisão contínua;
+    - `chave:` Bola, velocidade horizontal e saque da última previsão (privado);
+    - `previsao:` Última previsão (privado);
+    '''
+    def __init__(self, lado: int, continua: bool = False):
+        '''Método construtor.
+
+        Parâmetros:
+        - `lado:` 1 para a esquerda, 2 para a direita;
+        - `continua:` Se a bola usa colisão contínua, como na `Simulacao` (opcional);
+        '''
+        self.lado = lado
+        self.continua = continua
+        self.__chave = None
+        self.__previsao = 0
+
+    def intercept(self, bola) -> int:
+        '''Método que retorna a altura (centro) em que a bola chegará à raquete.
+
+        Parâmetros:
+        - `bola:` `BolaSimulada`;
+        '''
+        chave = (id(bola), bola.vel_x, bola.saques)
+        if chave != self.__chave:
+            self.__chave = chave
+            self.__previsao = int(intercept(bola.rect.x, bola.rect.y, bola.vel_x, bola.vel_y, self.lado, self.continua))
+        return self.__previsao
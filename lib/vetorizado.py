@@ -0,0 +1,181 @@
+from numpy import ndarray, zeros, ones, full, where, sign, stack, int64, random
+from typing import Callable
+from lib.constantes import *
+from lib.simulacao import SOBE, PARADO, DESCE
+from lib.trajetoria import intercept
+
+
+class SimulacaoVetorizada:
+    '''Várias partidas simultâneas guardadas como arrays (uma posição por partida).
+
+    Segue as mesmas regras da `Simulacao`, mas cada regra é aplicada a todas as partidas com uma
+    operação do NumPy, e as raquetes controladas por rede neural são decididas com uma única
+    chamada em lote.
+
+    Atributos:
+    - `quantidade:` Quantidade de partidas;
+    - `velocidade:` Velocidade da bola em cada eixo;
+    - `rng:` Gerador de números aleatórios das direções da bola;
+    - `bola_x:` Posição horizontal (canto esquerdo) das bolas;
+    - `bola_y:` Posição vertical (topo) das bolas;
+    - `vel_x:` Velocidades horizontais;
+    - `vel_y:` Velocidades verticais;
+    - `jogador1_y:` Topo das raquetes da esquerda;
+    - `jogador2_y:` Topo das raquetes da direita;
+    - `jogador1_pontos:` Pontos dos jogadores da esquerda;
+    - `jogador2_pontos:` Pontos dos jogadores da direita;
+    - `start:` Se a bola de cada partida está em jogo;
+    '''
+    def __init__(self, quantidade: int, seed: int | None = None, velocidade: int = VELOCIDADE):
+        '''Método construtor.
+
+        Parâmetros:
+        - `quantidade:` Quantidade de partidas;
+        - `seed:` Semente das direções da bola (opcional);
+        - `velocidade:` Velocidade da bola, até 20 para a bola não atravessar as raquetes (opcional);
+
+        ```
+        >>> SimulacaoVetorizada(10_000, seed=42)
+        ```
+        '''
+        self.quantidade = quantidade
+        self.velocidade = velocidade
+        self.rng = random.default_rng(seed)
+        self.bola_x = zeros(quantidade, dtype=int64)
+        self.bola_y = zeros(quantidade, dtype=int64)
+        self.vel_x = zeros(quantidade, dtype=int64)
+        self.vel_y = zeros(quantidade, dtype=int64)
+        self.jogador1_y = full(quantidade, 290, dtype=int64)
+        self.jogador2_y = full(quantidade, 290, dtype=int64)
+        self.jogador1_pontos = zeros(quantidade, dtype=int64)
+        self.jogador2_pontos = zeros(quantidade, dtype=int64)
+        self.start = zeros(quantidade, dtype=bool)
+        self.new_direction(ones(quantidade, dtype=bool))
+
+    def new_direction(self, mask: ndarray):
+        '''Método que recoloca as bolas no centro com uma nova direção.
+
+        Parâmetros:
+        - `mask:` Partidas que terão a bola recolocada;
+        '''
+        total = int(mask.sum())
+        self.bola_x[mask] = LARGURA // 2 - 5
+        self.bola_y[mask] = (ALTURA + 80) // 2 - 5
+        self.vel_x[mask] = self.rng.choice([-self.velocidade, self.velocidade], size=total)
+        self.vel_y[mask] = self.rng.choice([-self.velocidade, self.velocidade], size=total)
+
+    def paddle(self, lado: int) -> ndarray:
+        '''Método que retorna o topo das raquetes de um lado.
+
+        Parâmetros:
+        - `lado:` 1 para a esquerda, 2 para a direita;
+        '''
+        return self.jogador1_y if lado == 1 else self.jogador2_y
+
+    def step(self, acao1: ndarray, acao2: ndarray, iniciar: bool | ndarray = True):
+        '''Método que avança todas as partidas em um quadro.
+
+        Parâmetros:
+        - `acao1:` Ações das raquetes da esquerda;
+        - `acao2:` Ações das raquetes da direita;
+        - `iniciar:` Se a bola deve entrar em jogo (opcional);
+        '''
+        for y, acao in ((self.jogador1_y, acao1), (self.jogador2_y, acao2)):
+            y -= VELOCIDADE * ((acao == SOBE) & (y > 80))
+            y += VELOCIDADE * ((acao == DESCE) & (y + 100 < ALTURA))
+        self.start |= iniciar
+
+        self.bola_x += self.vel_x * self.start
+        self.bola_y += self.vel_y * self.start
+        bounce = self.start & ((self.bola_y + self.vel_y < 80) | (self.bola_y + 10 + self.vel_y > ALTURA))
+        self.vel_y[bounce] *= -1
+
+        left_out = self.bola_x + 10 < 0
+        right_out = self.bola_x > LARGURA
+        self.jogador2_pontos += left_out
+        self.jogador1_pontos += right_out
+        out = left_out | right_out
+        if out.any():
+            self.start[out] = False
+            self.new_direction(out)
+            self.jogador1_y[out] = (ALTURA + 80) // 2 - 50
+
+        hit = zeros(self.quantidade, dtype=bool)
+        for x, y in ((0, self.jogador1_y), (LARGURA - 10, self.jogador2_y)):
+            hit |= (self.bola_x < x + 10) & (x < self.bola_x + 10) & (self.bola_y < y + 100) & (y < self.bola_y + 10)
+        self.vel_x[hit] *= -1
+
+    def states(self, lado: int) -> ndarray:
+        '''Método que retorna o estado das raquetes de um lado em todas as partidas, no formato de `dataset.COLUNAS`.
+
+        Parâmetros:
+        - `lado:` 1 para a esquerda, 2 para a direita;
+        '''
+        raquete_y = self.paddle(lado) + 50
+        bola_y = self.bola_y + 5
+        return stack([full(self.quantidade, lado), raquete_y - bola_y, self.bola_x + 5, bola_y, self.vel_x, self.vel_y, raquete_y], axis=1)
+
+    def intercept(self, lado: int) -> ndarray:
+        '''Método que retorna a altura (centro) em que cada bola chegará às raquetes de um lado.
+
+        Parâmetros:
+        - `lado:` 1 para a esquerda, 2 para a direita;
+        '''
+        return intercept(self.bola_x, self.bola_y, self.vel_x, self.vel_y, lado)
+
+    def simulate(self, frames: int, controlador1: Callable[['SimulacaoVetorizada', int], ndarray], controlador2: Callable[['SimulacaoVetorizada', int], ndarray], gravador=None):
+        '''Método que avança todas as partidas vários quadros, com as bolas sempre em jogo.
+
+        Parâmetros:
+        - `frames:` Quantidade de quadros;
+        - `controlador1:` Função `(simulação, lado) -> ações` das raquetes da esquerda;
+        - `controlador2:` Função `(simulação, lado) -> ações` das raquetes da direita;
+        - `gravador:` `GravadorDataset` que recebe o estado e a ação das raquetes em cada quadro (opcional);
+
+        ```
+        >>> SimulacaoVetorizada(1000).simulate(10_000, tracking_controller, network_controller(rede))
+        ```
+        '''
+        for frame in range(frames):
+            acao1, acao2 = controlador1(self, 1), controlador2(self, 2)
+            if gravador is not None:
+                gravador.append_batch(self.states(1), acao1)
+                gravador.append_batch(self.states(2), acao2)
+            self.step(acao1, acao2)
+
+
+def network_actions(outputs: ndarray) -> ndarray:
+    '''Função que converte as saídas da rede (N, 2) em ações, como o `network_action` da `Simulacao`.
+
+    Parâmetros:
+    - `outputs:` Saídas da rede neural, uma partida por linha;
+    '''
+    up, down = outputs[:, 0] != 0, outputs[:, 1] != 0
+    return where(up & ~down, SOBE, where(down & ~up, DESCE, PARADO))
+
+
+def network_controller(rede) -> Callable[[SimulacaoVetorizada, int], ndarray]:
+    '''Função que cria um controlador que decide as ações de todas as partidas com uma chamada em lote.
+
+    Redes com duas entradas também recebem a distância até a altura prevista das bolas.
+
+    Parâmetros:
+    - `rede:` `Network` ou `CompiledNetwork`;
+    '''
+    def controlador(simulacao: SimulacaoVetorizada, lado: int) -> ndarray:
+        centro = simulacao.paddle(lado) + 50
+        inputs = [centro - (simulacao.bola_y + 5)]
+        if rede.get_inputs() == 2:
+            inputs.append(centro - simulacao.intercept(lado))
+        return network_actions(rede.forward_batch(stack(inputs, axis=1)))
+    return controlador
+
+
+def tracking_controller(simulacao: SimulacaoVetorizada, lado: int) -> ndarray:
+    '''Controlador simples que segue a altura da bola em todas as partidas.
+
+    Parâmetros:
+    - `simulacao:` Simulação vetorizada;
+    - `lado:` 1 para a esquerda, 2 para a direita;
+    '''
+    return sign((simulacao.bola_y + 5) - (simulacao.paddle(lado) + 50))
@@ -1,4 +1,10 @@
-from lib.classes import *
+import argparse, pygame, random
+from lib.constantes import *
+from lib.classes import Game
+from lib.perfil import Perfilador, secao
+from lib.renderizador import RenderizadorParcial
+from lib.replay import Replay
+from lib.dataset import GravadorDataset
 
 
 class Pong:
@@ -7,36 +13,174 @@ class Pong:
     Atributos:
     - `screen:` Tela do jogo;
     - `clock:` Relógio do jogo;
+    - `perfil:` Perfilador dos quadros, ou `None`;
+    - `perfil_saida:` Arquivo onde o perfil é salvo ao sair;
+    - `parcial:` Se apenas as regiões que mudaram são redesenhadas;
+    - `seed:` Semente da partida, ou `None`;
+    - `replay:` Replay sendo reproduzido, ou `None`;
+    - `gravacao:` Replay sendo gravado, ou `None`;
+    - `gravacao_saida:` Arquivo onde a gravação é salva ao sair;
+    - `pular:` Quadros do replay avançados sem desenhar antes de abrir a partida;
+    - `quadro:` Número do quadro atual;
+    - `gravador:` Gravador do dataset (estado, ação), ou `None`;
+    - `hz:` Passos da física por segundo, independentes da taxa de quadros;
+    - `velocidade:` Velocidade da bola, em pixels por segundo;
+    - `continua:` Se a bola usa colisão contínua;
+    - `vsync:` Se a tela é sincronizada com o monitor em vez de limitada a `FPS`;
+    - `acumulado:` Tempo real ainda não simulado, em passos da física;
     '''
-    def __init__(self):
-        '''Método construtor'''
+    def __init__(self, perfil_saida: str | None = None, parcial: bool = False, seed: int | None = None, gravacao_saida: str | None = None, replay: str | None = None, pular: int = 0, dataset: str | None = None, hz: int = FISICA_HZ, velocidade: int = VELOCIDADE_BOLA, continua: bool = False, vsync: bool = False):
+        '''Método construtor
+
+        Parâmetros:
+        - `perfil_saida:` Arquivo CSV ou JSON que ativa o perfilador e recebe os tempos ao sair (opcional);
+        - `parcial:` Usa o `RenderizadorParcial` (retângulos sujos) em vez de redesenhar a tela toda (opcional);
+        - `seed:` Semente da partida (opcional);
+        - `gravacao_saida:` Arquivo onde a partida é gravada ao sair (opcional);
+        - `replay:` Arquivo de replay reproduzido; depois do último quadro o teclado volta a valer (opcional);
+        - `pular:` Quadros do replay avançados sem desenhar (opcional);
+        - `dataset:` Diretório onde as amostras (estado, ação) das duas raquetes são gravadas (opcional);
+        - `hz:` Passos da física por segundo; muda a precisão da física, não a velocidade do jogo (opcional);
+        - `velocidade:` Velocidade da bola, em pixels por segundo (opcional);
+        - `continua:` Usa colisão contínua, para a bola andando mais de 20 pixels por passo (opcional);
+        - `vsync:` Sincroniza a tela com o monitor (opcional);
+        '''
         pygame.init()
+        self.parcial = parcial
+        self.perfil_saida = perfil_saida
+        self.perfil = Perfilador() if perfil_saida else None
+        self.replay = Replay.load(replay) if replay else None
+        if self.replay:
+            seed, velocidade, continua, hz = self.replay.seed, self.replay.velocidade, self.replay.continua, self.replay.hz
+        elif gravacao_saida and seed is None:
+            seed = random.randrange(2 ** 31)
+        self.seed = seed
+        self.gravacao_saida = gravacao_saida
+        self.gravacao = Replay(seed, velocidade=velocidade, continua=continua, hz=hz) if gravacao_saida else None
+        self.pular = pular
+        self.quadro = 0
+        self.gravador = GravadorDataset(dataset) if dataset else None
+        self.hz = hz
+        self.velocidade = velocidade
+        self.continua = continua
+        self.vsync = vsync
+        self.acumulado = 0.0
         self.screen_config()
         self.loop()
     
     def screen_config(self):
         '''Método para configuração da tela'''
-        self.screen = pygame.display.set_mode((LARGURA, ALTURA))
+        if self.vsync:
+            self.screen = pygame.display.set_mode((LARGURA, ALTURA), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((LARGURA, ALTURA))
         pygame.display.set_caption('Pong IA')
         self.clock = pygame.time.Clock()
     
     def loop(self):
         '''Loop global do jogo'''
-        jogo = Game(self.screen)
+        jogo = Game(self.screen, self.perfil, self.seed, self.velocidade, self.continua, self.hz)
+        jogo.gravador = self.gravador
+        for frame in range(self.pular):
+            self.register(jogo.update(self.entrada()))
+        if self.parcial:
+            self.loop_parcial(jogo)
         while True:
             self.screen.fill('#202020')
-            self.clock.tick(FPS)
-            self.eventos()
-            jogo.run()
-            pygame.display.update()
+            passos = self.steps()
+            with secao(self.perfil, 'eventos'):
+                self.eventos()
+            for passo in range(passos):
+                self.register(jogo.update(self.entrada()))
+            jogo.draw()
+            if self.perfil:
+                self.perfil.draw(self.screen)
+            with secao(self.perfil, 'flip'):
+                pygame.display.update()
+            if self.perfil:
+                self.perfil.next_frame()
     
+    def loop_parcial(self, jogo: Game):
+        '''Loop do jogo redesenhando só as regiões que mudaram.
+
+        Parâmetros:
+        - `jogo:` Jogo;
+        '''
+        renderizador = RenderizadorParcial(jogo)
+        while True:
+            passos = self.steps()
+            with secao(self.perfil, 'eventos'):
+                self.eventos()
+            for passo in range(passos):
+                self.register(jogo.update(self.entrada()))
+            renderizador.draw()
+            if self.perfil:
+                renderizador.add_dirty(self.perfil.draw(self.screen))
+            with secao(self.perfil, 'flip'):
+                renderizador.flip()
+            if self.perfil:
+                self.perfil.next_frame()
+
+    def steps(self) -> int:
+        '''Método que espera o próximo quadro e retorna quantos passos da física cabem no tempo real que passou.
+
+        O tempo de cada quadro é acumulado e consumido em passos fixos de `1 / hz` segundos, então
+        a velocidade do jogo não depende da taxa de quadros nem da máquina. Quadros quase iguais a
+        `1 / FPS` contam como exatamente `1 / FPS`, para a oscilação do relógio não alternar
+        quadros com zero e dois passos, e atrasos maiores que `ATRASO_MAXIMO` são descartados.
+        '''
+        tempo = min(self.clock.tick(0 if self.vsync else FPS) / 1000, ATRASO_MAXIMO)
+        if abs(tempo - 1 / FPS) < 0.002:
+            tempo = 1 / FPS
+        self.acumulado += tempo * self.hz
+        passos = int(self.acumulado + 1e-9)
+        self.acumulado -= passos
+        return passos
+
+    def entrada(self) -> tuple | None:
+        '''Método que retorna a entrada do replay no quadro atual, ou `None` para ler o teclado.'''
+        if self.replay and self.quadro < len(self.replay):
+            return self.replay.input(self.quadro)
+        return None
+
+    def register(self, entrada: tuple):
+        '''Método que avança o contador de passos e grava a entrada usada.
+
+        Parâmetros:
+        - `entrada:` `(ação, iniciar)` usada no passo;
+        '''
+        self.quadro += 1
+        if self.gravacao is not None:
+            self.gravacao.record(*entrada)
+
     def eventos(self):
         '''Método para os eventos'''
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if self.perfil:
+                    self.perfil.dump(self.perfil_saida)
+                if self.gravacao is not None:
+                    self.gravacao.save(self.gravacao_saida)
+                if self.gravador is not None:
+                    self.gravador.close()
                 pygame.quit()
                 exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.perfil:
+                self.perfil.overlay = not self.perfil.overlay
 
 
 if __name__ == '__main__':
-    Pong()
+    parser = argparse.ArgumentParser(description='Pong IA')
+    parser.add_argument('--perfil', metavar='ARQUIVO', help='Mede o tempo de cada seção do quadro (F3 mostra/esconde) e salva em CSV ou JSON ao sair')
+    parser.add_argument('--parcial', action='store_true', help='Redesenha só as regiões que mudaram (retângulos sujos)')
+    parser.add_argument('--seed', type=int, help='Semente da partida')
+    parser.add_argument('--gravar', metavar='ARQUIVO', help='Grava a partida (semente e teclas) ao sair')
+    parser.add_argument('--replay', metavar='ARQUIVO', help='Reproduz uma partida gravada')
+    parser.add_argument('--pular', type=int, default=0, metavar='N', help='Avança N quadros do replay sem desenhar')
+    parser.add_argument('--dataset', metavar='DIRETORIO', help='Grava as amostras (estado, ação) das duas raquetes para treino')
+    parser.add_argument('--hz', type=int, default=FISICA_HZ, help='Passos da física por segundo, independentes da taxa de quadros e da velocidade do jogo')
+    parser.add_argument('--velocidade', type=int, default=VELOCIDADE_BOLA, help='Velocidade da bola, em pixels por segundo')
+    parser.add_argument('--continua', action='store_true', help='Colisão contínua: a bola não atravessa as raquetes em velocidades altas')
+    parser.add_argument('--vsync', action='store_true', help='Sincroniza a tela com o monitor')
+    args = parser.parse_args()
+    Pong(args.perfil, args.parcial, args.seed, args.gravar, args.replay, args.pular, args.dataset, args.hz, args.velocidade, args.continua, args.vsync)
@@ -0,0 +1,96 @@
+import argparse, asyncio, json, os, time
+from lib.constantes import *
+from lib.rede_neural import Network, CompiledNetwork
+from lib.servidor import Servidor, Cliente
+from lib.simulacao import SOBE, PARADO, DESCE
+
+
+def load_network(path: str, dtype: str = 'float64') -> CompiledNetwork:
+    '''Função que carrega a rede das raquetes sem jogador.
+
+    Parâmetros:
+    - `path:` Arquivo `.bin` (formato binário) ou no formato do `network.json`;
+    - `dtype:` Tipo dos pesos na inferência (opcional);
+    '''
+    if path.endswith('.bin'):
+        rede = CompiledNetwork.load(path)
+        return rede if dtype in ('float64', rede.get_dtype()) else rede.quantize(dtype)
+    with open(path, 'r') as file:
+        return Network(**json.load(file)).compile(dtype)
+
+
+async def loopback(porta: int, clientes: int, segundos: float) -> dict:
+    '''Função que conecta clientes robôs ao próprio servidor por localhost, um por partida, e mede o que eles recebem.
+
+    Cada robô joga do lado esquerdo seguindo a bola, contra a rede do servidor.
+
+    Parâmetros:
+    - `porta:` Porta do servidor;
+    - `clientes:` Quantidade de clientes;
+    - `segundos:` Duração da medida;
+    '''
+    async def jogar(numero: int) -> int:
+        cliente = await Cliente.connect('127.0.0.1', porta)
+        estado = await cliente.join(numero, 1)
+        estados, ultima, fim = 0, None, time.perf_counter() + segundos
+        while time.perf_counter() < fim:
+            centro, bola = estado['jogador1_y'] + 50, estado['bola_y'] + 5
+            acao = SOBE if bola < centro else DESCE if bola > centro else PARADO
+            if acao != ultima:
+                cliente.send(acao, True)
+                ultima = acao
+            estado = await cliente.state()
+            estados += 1
+        await cliente.close()
+        return estados
+    recebidos = await asyncio.gather(*[jogar(numero) for numero in range(clientes)])
+    return {'clientes': clientes, 'estados': sum(recebidos), 'estados_por_cliente_por_segundo': sum(recebidos) / clientes / segundos}
+
+
+async def serve(args: argparse.Namespace):
+    '''Função que abre o servidor, cria as partidas só entre redes e executa os passos.
+
+    Parâmetros:
+    - `args:` Argumentos da linha de comando;
+    '''
+    servidor = Servidor(load_network(args.rede, args.dtype), args.hz, args.velocidade, args.continua)
+    for numero in range(args.partidas):
+        servidor.create_match(2 ** 31 + numero, permanente=True)
+    porta = await servidor.start_tcp(args.host, args.porta)
+    print(f'TCP em {args.host}:{porta}')
+    if args.unix:
+        await servidor.start_unix(args.unix)
+        print(f'Unix em {args.unix}')
+    passos = asyncio.create_task(servidor.run())
+    try:
+        if args.loopback:
+            inicio, tempo = servidor.frames, time.perf_counter()
+            resultado = await loopback(porta, args.loopback, args.segundos)
+            resultado['passos_por_segundo'] = (servidor.frames - inicio) / (time.perf_counter() - tempo)
+            print(json.dumps(resultado, indent=2))
+        else:
+            await passos
+    finally:
+        passos.cancel()
+        await servidor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de partidas sem tela, com a rede decidindo em lote por todas as partidas.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=5000, help='Porta TCP (0 para uma livre)')
+    parser.add_argument('--unix', help='Caminho de um socket Unix, além do TCP')
+    parser.add_argument('--rede', default=os.path.join(DIRETORIO_PRINCIPAL, 'network.json'), help='Rede das raquetes sem jogador (.json ou .bin)')
+    parser.add_argument('--dtype', choices=['float64', 'float32', 'int8'], default='float64', help='Tipo dos pesos na inferência')
+    parser.add_argument('--partidas', type=int, default=0, help='Partidas só entre redes, sempre em andamento, numeradas a partir de 2^31')
+    parser.add_argument('--hz', type=int, default=FISICA_HZ, help='Passos da simulação por segundo')
+    parser.add_argument('--velocidade', type=int, default=VELOCIDADE_BOLA, help='Velocidade da bola, em pixels por segundo')
+    parser.add_argument('--continua', action='store_true', help='Colisão contínua')
+    parser.add_argument('--loopback', type=int, metavar='CLIENTES', help='Testa o servidor com clientes robôs no mesmo processo e sai')
+    parser.add_argument('--segundos', type=float, default=5, help='Duração do teste com --loopback')
+    args = parser.parse_args()
+    asyncio.run(serve(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+from numpy import array, zeros
+from numpy.testing import assert_allclose
+from lib.rede_neural import Network
+
+
+def loss(rede: Network, inputs: list, targets: list, states: list) -> float:
+    '''Função que retorna a perda (metade do erro quadrático) de um passo, a partir de um estado oculto fixo.
+
+    Parâmetros:
+    - `rede:` Rede;
+    - `inputs:` Entradas do passo;
+    - `targets:` Saídas esperadas;
+    - `states:` Estado oculto de antes do passo (formato de `get_hidden_states`);
+    '''
+    rede.set_hidden_states(states)
+    return float(((array(targets) - array(rede.forward(inputs))) ** 2).sum()) / 2
+
+
+def finite_differences(rede: Network, inputs: list, targets: list, epsilon: float = 1e-6) -> tuple:
+    '''Função que retorna o gradiente da perda em relação a cada parâmetro por diferenças centrais, e o estado oculto usado.
+
+    Parâmetros:
+    - `rede:` Rede;
+    - `inputs:` Entradas do passo;
+    - `targets:` Saídas esperadas;
+    - `epsilon:` Perturbação de cada parâmetro (opcional);
+    '''
+    states = rede.get_hidden_states()
+    parameters = rede.get_parameters()
+    gradient = zeros(len(parameters))
+    for idx in range(len(parameters)):
+        for sinal in (1, -1):
+            perturbed = parameters.copy()
+            perturbed[idx] += sinal * epsilon
+            rede.set_parameters(perturbed)
+            gradient[idx] += sinal * loss(rede, inputs, targets, states) / (2 * epsilon)
+    rede.set_parameters(parameters)
+    rede.set_hidden_states(states)
+    return gradient, states
+
+
+def check_backpropagation(structure: list[dict], warmup: list | None = None):
+    '''Função que compara o passo do `backpropagation` com `-learning_rate * gradiente` calculado numericamente.
+
+    Parâmetros:
+    - `structure:` Estrutura da rede;
+    - `warmup:` Entradas passadas antes da medida, para o estado oculto não ser zero (opcional);
+    '''
+    rede = Network(structure, weights_initialization='xavier', seed=3)
+    rede.set_biases([[0.3 * (idx + 1) - 0.5 * neuron for neuron in range(layer['numbers_of_neurons'])] for idx, layer in enumerate(structure[1:])])
+    for inputs in warmup or []:
+        rede.forward(inputs)
+    inputs, targets, learning_rate = [0.7, -0.4], [0.9], 1e-3
+    gradient, states = finite_differences(rede, inputs, targets)
+    rede.forward(inputs)
+    expected_states = rede.get_hidden_states()
+    rede.set_hidden_states(states)
+    before = rede.get_parameters()
+    rede.backpropagation(inputs, targets, learning_rate)
+    assert_allclose(rede.get_parameters() - before, -learning_rate * gradient, rtol=1e-4, atol=1e-10)
+    # O estado oculto avança como em `forward`, com os parâmetros de antes do ajuste.
+    for state, expected in zip(rede.get_hidden_states(), expected_states):
+        if expected is not None:
+            assert_allclose(state, expected)
+
+
+def test_backpropagation_feed_forward():
+    check_backpropagation([{'numbers_of_neurons': 2}, {'numbers_of_neurons': 3, 'activation_function': 'tanh'}, {'numbers_of_neurons': 1, 'activation_function': 'sigmoid'}])
+
+
+def test_backpropagation_recurrent():
+    structure = [{'numbers_of_neurons': 2}, {'numbers_of_neurons': 3, 'activation_function': 'sigmoid', 'recurrent': True}, {'numbers_of_neurons': 1, 'activation_function': 'sigmoid'}]
+    check_backpropagation(structure, warmup=[[0.5, 1.0], [-0.2, 0.8]])
+
+
+def test_backpropagation_recurrent_output():
+    structure = [{'numbers_of_neurons': 2}, {'numbers_of_neurons': 3, 'activation_function': 'tanh'}, {'numbers_of_neurons': 1, 'activation_function': 'tanh', 'recurrent': True}]
+    check_backpropagation(structure, warmup=[[0.5, 1.0]])
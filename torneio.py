@@ -0,0 +1,121 @@
+import argparse, csv, glob, json, os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from lib.rede_neural import Network, CompiledNetwork
+from lib.vetorizado import SimulacaoVetorizada, network_controller, tracking_controller
+
+
+@lru_cache(maxsize=None)
+def load_network(path: str, lado: int = 2, dtype: str = 'float64') -> CompiledNetwork:
+    '''Função que carrega uma rede, uma única vez por processo.
+
+    Arquivos `.bin` (formato binário de `Network.save`) são abertos por memória mapeada; os
+    demais são lidos como o `network.json`. O lado faz parte da chave para que candidato e referência nunca dividam o estado oculto.
+
+    Parâmetros:
+    - `path:` Caminho do arquivo;
+    - `lado:` Lado em que a rede joga (opcional);
+    - `dtype:` Tipo dos pesos na inferência: `float64`, `float32` ou `int8` (opcional);
+    '''
+    if path.endswith('.bin'):
+        rede = CompiledNetwork.load(path)
+        return rede if dtype in ('float64', rede.get_dtype()) else rede.quantize(dtype)
+    with open(path, 'r') as file:
+        return Network(**json.load(file)).compile(dtype)
+
+
+def play(path: str, seed: int, partidas: int, frames: int, referencia: str | None = None, dtype: str = 'float64') -> dict:
+    '''Função que joga uma rodada de partidas simultâneas de um candidato contra o oponente.
+
+    O candidato joga do lado direito, como o `PlayerIA`.
+
+    Parâmetros:
+    - `path:` Caminho do candidato;
+    - `seed:` Semente da rodada;
+    - `partidas:` Quantidade de partidas da rodada;
+    - `frames:` Quadros de cada partida;
+    - `referencia:` Caminho da rede de referência, ou `None` para o controlador que segue a bola (opcional);
+    - `dtype:` Tipo dos pesos do candidato na inferência (opcional);
+    '''
+    rede = load_network(path, 2, dtype)
+    rede.reset_hidden_states()
+    if referencia is None:
+        oponente = tracking_controller
+    else:
+        oponente = load_network(referencia, 1)
+        oponente.reset_hidden_states()
+        oponente = network_controller(oponente)
+    simulacao = SimulacaoVetorizada(partidas, seed)
+    simulacao.simulate(frames, oponente, network_controller(rede))
+    feitos, sofridos = simulacao.jogador2_pontos, simulacao.jogador1_pontos
+    return {
+        'candidato': path,
+        'vitorias': int((feitos > sofridos).sum()),
+        'empates': int((feitos == sofridos).sum()),
+        'derrotas': int((feitos < sofridos).sum()),
+        'pontos_feitos': int(feitos.sum()),
+        'pontos_sofridos': int(sofridos.sum())
+    }
+
+
+def tournament(paths: list[str], rodadas: int, partidas: int, frames: int, referencia: str | None = None, seed: int = 0, workers: int | None = None, dtype: str = 'float64') -> list[dict]:
+    '''Função que avalia todos os candidatos em paralelo e retorna a tabela ordenada.
+
+    Todos os candidatos jogam com as mesmas sementes, então as rodadas são comparáveis.
+
+    Parâmetros:
+    - `paths:` Caminhos dos candidatos;
+    - `rodadas:` Rodadas por candidato (cada rodada é uma tarefa do pool);
+    - `partidas:` Partidas simultâneas por rodada;
+    - `frames:` Quadros de cada partida;
+    - `referencia:` Caminho da rede de referência (opcional);
+    - `seed:` Semente da primeira rodada (opcional);
+    - `workers:` Quantidade de processos, por padrão um por núcleo (opcional);
+    - `dtype:` Tipo dos pesos dos candidatos na inferência (opcional);
+    '''
+    tasks = [(path, seed + rodada) for path in paths for rodada in range(rodadas)]
+    results = {path: {'candidato': path, 'vitorias': 0, 'empates': 0, 'derrotas': 0, 'pontos_feitos': 0, 'pontos_sofridos': 0} for path in paths}
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(play, *zip(*tasks), [partidas] * len(tasks), [frames] * len(tasks), [referencia] * len(tasks), [dtype] * len(tasks), chunksize=chunksize):
+            for key, value in result.items():
+                if key != 'candidato':
+                    results[result['candidato']][key] += value
+    table = list(results.values())
+    for row in table:
+        row['taxa_vitorias'] = row['vitorias'] / (rodadas * partidas)
+        row['saldo'] = row['pontos_feitos'] - row['pontos_sofridos']
+    return sorted(table, key=lambda row: (row['taxa_vitorias'], row['saldo']), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Torneio entre redes no formato do network.json.')
+    parser.add_argument('diretorio', help='Diretório com os arquivos .json ou .bin dos candidatos')
+    parser.add_argument('--referencia', help='Rede de referência usada como oponente (padrão: controlador que segue a bola)')
+    parser.add_argument('--rodadas', type=int, default=8, help='Rodadas por candidato')
+    parser.add_argument('--partidas', type=int, default=256, help='Partidas simultâneas por rodada')
+    parser.add_argument('--frames', type=int, default=3600, help='Quadros por partida')
+    parser.add_argument('--seed', type=int, default=0, help='Semente da primeira rodada')
+    parser.add_argument('--workers', type=int, help='Quantidade de processos')
+    parser.add_argument('--saida', default='torneio.csv', help='Arquivo CSV com a tabela')
+    parser.add_argument('--dtype', choices=['float64', 'float32', 'int8'], default='float64', help='Tipo dos pesos dos candidatos na inferência')
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.diretorio, '*.json')) + glob.glob(os.path.join(args.diretorio, '*.bin')))
+    if not paths:
+        parser.error(f'no .json or .bin files found in "{args.diretorio}"')
+    table = tournament(paths, args.rodadas, args.partidas, args.frames, args.referencia, args.seed, args.workers, args.dtype)
+
+    columns = ['candidato', 'taxa_vitorias', 'vitorias', 'empates', 'derrotas', 'pontos_feitos', 'pontos_sofridos', 'saldo']
+    with open(args.saida, 'w', newline='') as file:
+        writer = csv.DictWriter(file, columns)
+        writer.writeheader()
+        writer.writerows(table)
+    print(f'{"#":>3}  {"candidato":<40} {"vitórias":>9} {"E":>6} {"D":>6} {"saldo":>7}')
+    for position, row in enumerate(table, 1):
+        print(f'{position:>3}  {os.path.basename(row["candidato"]):<40} {row["taxa_vitorias"]:>9.1%} {row["empates"]:>6} {row["derrotas"]:>6} {row["saldo"]:>7}')
+
+
+if __name__ == '__main__':
+    main()